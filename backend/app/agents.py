@@ -1,9 +1,11 @@
 """News Nest Agents - Multiple AI agents with distinct personalities."""
 
-from typing import List, Dict, Any, Optional
-from .gemini import gemini_generate
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Iterator
+from .gemini import gemini_generate, gemini_stream
 from .config import get_gemini_api_key, get_newsapi_key
 from .news_helper import fetch_headlines_prompt
+from .json_utils import extract_json_object
 
 # Shared formatting instructions for all agents when injecting headlines
 COMMON_HEADLINES_FORMATTING = (
@@ -35,10 +37,31 @@ class BaseAgent:
         if api_key is None:
             api_key = get_gemini_api_key()
         
-        system_prompt = self.get_system_prompt(is_first_message=is_first_message, user_name=user_name, parrot_name=parrot_name)
+        system_prompt = self.cached_system_prompt(is_first_message, user_name, parrot_name)
         result = gemini_generate(contents=contents, system_prompt=system_prompt, api_key=api_key)
         return result
     
+    def respond_stream(self, contents: List[Dict[str, Any]], api_key: Optional[str] = None, is_first_message: bool = False, user_name: Optional[str] = None, parrot_name: Optional[str] = None) -> Iterator[str]:
+        """Stream a response from the agent as text chunks.
+        
+        Takes the same arguments as `respond`, but yields the reply as Gemini
+        produces it instead of waiting for the full text.
+        """
+        if api_key is None:
+            api_key = get_gemini_api_key()
+        
+        system_prompt = self.cached_system_prompt(is_first_message, user_name, parrot_name)
+        return gemini_stream(contents=contents, system_prompt=system_prompt, api_key=api_key)
+    
+    @lru_cache(maxsize=256)
+    def cached_system_prompt(self, is_first_message: bool = False, user_name: Optional[str] = None, parrot_name: Optional[str] = None) -> str:
+        """Memoized `get_system_prompt`.
+
+        The prompts only depend on these three arguments, and the agents are
+        module-level singletons, so each combination is rendered once.
+        """
+        return self.get_system_prompt(is_first_message=is_first_message, user_name=user_name, parrot_name=parrot_name)
+
     def get_system_prompt(self, is_first_message: bool = False, user_name: Optional[str] = None, parrot_name: Optional[str] = None) -> str:
         """Return the system prompt for this agent. Override in subclasses.
         
@@ -95,10 +118,8 @@ Respond ONLY as JSON with keys:
 }}"""
         try:
             result = gemini_generate(contents=[{"role":"user","parts":[prompt]}], api_key=key)
-            import json, re
             resp = result.get("text","")
-            match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-            data = json.loads(match.group()) if match else {}
+            data = extract_json_object(resp) or {}
             wants = bool(data.get("wants_headlines", False))
             sent = str(data.get("sentiment", "neutral")).lower()
             if sent not in ["positive","neutral","negative"]:
@@ -226,10 +247,8 @@ Respond ONLY as JSON with keys:
 }}"""
         try:
             result = gemini_generate(contents=[{"role":"user","parts":[prompt]}], api_key=key)
-            import json, re
             resp = result.get("text","")
-            match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-            data = json.loads(match.group()) if match else {}
+            data = extract_json_object(resp) or {}
             wants = bool(data.get("wants_headlines", False))
             return {"wants_headlines": wants}
         except Exception:
@@ -339,10 +358,8 @@ Respond ONLY as JSON with keys:
 }}"""
         try:
             result = gemini_generate(contents=[{"role":"user","parts":[prompt]}], api_key=key)
-            import json, re
             resp = result.get("text","")
-            match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-            data = json.loads(match.group()) if match else {}
+            data = extract_json_object(resp) or {}
             wants = bool(data.get("wants_headlines", False))
             return {"wants_headlines": wants}
         except Exception:
@@ -453,10 +470,8 @@ Respond ONLY as JSON with keys:
 }}"""
         try:
             result = gemini_generate(contents=[{"role":"user","parts":[prompt]}], api_key=key)
-            import json, re
             resp = result.get("text","")
-            match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-            data = json.loads(match.group()) if match else {}
+            data = extract_json_object(resp) or {}
             wants = bool(data.get("wants_headlines", False))
             return {"wants_headlines": wants}
         except Exception:
@@ -569,10 +584,8 @@ Respond ONLY as JSON with keys:
 }}"""
         try:
             result = gemini_generate(contents=[{"role":"user","parts":[prompt]}], api_key=key)
-            import json, re
             resp = result.get("text","")
-            match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-            data = json.loads(match.group()) if match else {}
+            data = extract_json_object(resp) or {}
             wants = bool(data.get("wants_headlines", False))
             return {"wants_headlines": wants}
         except Exception:
@@ -663,10 +676,8 @@ Respond ONLY as JSON with keys:
 }}"""
         try:
             result = gemini_generate(contents=[{"role":"user","parts":[prompt]}], api_key=key)
-            import json, re
             resp = result.get("text","")
-            match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-            data = json.loads(match.group()) if match else {}
+            data = extract_json_object(resp) or {}
             wants = bool(data.get("wants_headlines", False))
             return {"wants_headlines": wants}
         except Exception:
@@ -757,10 +768,8 @@ Respond ONLY as JSON with keys:
 }}"""
         try:
             result = gemini_generate(contents=[{"role":"user","parts":[prompt]}], api_key=key)
-            import json, re
             resp = result.get("text","")
-            match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-            data = json.loads(match.group()) if match else {}
+            data = extract_json_object(resp) or {}
             wants = bool(data.get("wants_headlines", False))
             return {"wants_headlines": wants}
         except Exception:
@@ -854,10 +863,8 @@ Respond ONLY as JSON with keys:
 }}"""
         try:
             result = gemini_generate(contents=[{"role":"user","parts":[prompt]}], api_key=key)
-            import json, re
             resp = result.get("text","")
-            match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-            data = json.loads(match.group()) if match else {}
+            data = extract_json_object(resp) or {}
             wants = bool(data.get("wants_headlines", False))
             return {"wants_headlines": wants}
         except Exception:
@@ -951,10 +958,8 @@ Respond ONLY as JSON with keys:
 }}"""
         try:
             result = gemini_generate(contents=[{"role":"user","parts":[prompt]}], api_key=key)
-            import json, re
             resp = result.get("text","")
-            match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-            data = json.loads(match.group()) if match else {}
+            data = extract_json_object(resp) or {}
             wants = bool(data.get("wants_headlines", False))
             return {"wants_headlines": wants}
         except Exception:
@@ -1046,10 +1051,8 @@ Respond ONLY as JSON with keys:
 }}"""
         try:
             result = gemini_generate(contents=[{"role":"user","parts":[prompt]}], api_key=key)
-            import json, re
             resp = result.get("text","")
-            match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-            data = json.loads(match.group()) if match else {}
+            data = extract_json_object(resp) or {}
             wants = bool(data.get("wants_headlines", False))
             return {"wants_headlines": wants}
         except Exception:
@@ -1,9 +1,8 @@
 """Helper functions for generating chart and timeline data from agent responses."""
 
 from typing import Optional, Dict, Any, List, Tuple
-import json
-import re
 from .gemini import gemini_generate
+from .json_utils import extract_json_object
 from .config import get_gemini_api_key
 
 
@@ -115,9 +114,8 @@ Examples:
     try:
         result = gemini_generate(contents=[{"role": "user", "parts": [prompt]}], api_key=api_key)
         resp = result.get("text", "")
-        match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-        if match:
-            data = json.loads(match.group())
+        data = extract_json_object(resp)
+        if data is not None:
             return {
                 "needs_visualization": bool(data.get("needs_visualization", False)),
                 "visualization_type": data.get("visualization_type"),
@@ -200,9 +198,8 @@ Use realistic values appropriate for the topic and keep the total number of data
     try:
         result = gemini_generate(contents=[{"role": "user", "parts": [prompt]}], api_key=api_key)
         resp = result.get("text", "")
-        match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-        if match:
-            data = json.loads(match.group())
+        data = extract_json_object(resp)
+        if data is not None:
             chart = {
                 "type": chart_type,
                 "title": data.get("title", topic),
@@ -275,9 +272,8 @@ Use ISO format dates (YYYY-MM-DD). Include events in chronological order and kee
     try:
         result = gemini_generate(contents=[{"role": "user", "parts": [prompt]}], api_key=api_key)
         resp = result.get("text", "")
-        match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-        if match:
-            data = json.loads(match.group())
+        data = extract_json_object(resp)
+        if data is not None:
             timeline = {
                 "title": data.get("title", topic),
                 "description": data.get("description"),
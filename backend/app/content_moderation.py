@@ -4,6 +4,7 @@ from typing import Optional, Dict, Any, Tuple
 import re
 import logging
 from .gemini import gemini_generate
+from .json_utils import extract_json_object
 from .config import get_gemini_api_key
 
 logger = logging.getLogger(__name__)
@@ -21,47 +22,18 @@ _PROFANITY_PATTERNS = [
     # Note: We're NOT blocking words that might appear in legitimate news
 ]
 
+# Single alternation so the message is scanned once rather than once per pattern.
+# The patterns are ASCII-only, so re.ASCII skips Unicode case folding; non-ASCII
+# profanity is left to the LLM check below, which handles context anyway.
+_PROFANITY_RE = re.compile("|".join(_PROFANITY_PATTERNS), re.IGNORECASE | re.ASCII)
+# Every current pattern needs a masking asterisk, so messages without one can
+# skip the regex entirely. Re-derived here in case unmasked patterns are added.
+_PROFANITY_NEEDS_ASTERISK = all(r"\*" in pattern for pattern in _PROFANITY_PATTERNS)
 
-def moderate_content(
-    user_message: str,
-    api_key: Optional[str] = None,
-    use_llm: bool = True
-) -> Tuple[bool, Optional[str]]:
-    """
-    Moderate user content to detect inappropriate language or queries.
-    
-    Args:
-        user_message: The user's message to check
-        api_key: Optional Gemini API key (will fetch if not provided)
-        use_llm: Whether to use LLM-based moderation (more accurate but slower)
-    
-    Returns:
-        Tuple of (is_appropriate: bool, reason: Optional[str])
-        - If is_appropriate is True, content is safe
-        - If False, reason explains why it was flagged
-    """
-    if not user_message or not user_message.strip():
-        return True, None
-    
-    # Very minimal pattern check - only block obvious, intentional profanity
-    # Most content should go through LLM for context-aware evaluation
-    text_lower = user_message.lower()
-    for pattern in _PROFANITY_PATTERNS:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            logger.info(f"[content_moderation] Blocked message due to obvious profanity (pattern match)")
-            return False, "Your message contains inappropriate language. Please rephrase your question in a respectful way."
-    
-    # Use LLM-based moderation for more nuanced detection
-    if use_llm:
-        try:
-            if not api_key:
-                api_key = get_gemini_api_key()
-            
-            if not api_key:
-                # No API key available, fall back to basic checks
-                return True, None
-            
-            moderation_prompt = f"""You are a content moderation assistant for a news app designed for teens and young adults.
+
+# The moderation prompt is constant apart from the user message, so it is
+# split once at import and only concatenated per request.
+_MOD_PROMPT_PRE = """You are a content moderation assistant for a news app designed for teens and young adults.
 
 Analyze this user message and determine if it contains INAPPROPRIATE INTENT:
 1. Intentional profanity or vulgar language used to be offensive (not just words that might appear in news)
@@ -70,7 +42,9 @@ Analyze this user message and determine if it contains INAPPROPRIATE INTENT:
 4. Requests for harmful or illegal content
 5. Clearly inappropriate language used with intent to be rude or offensive
 
-User message: "{user_message}"
+User message: \""""
+
+_MOD_PROMPT_POST = """\"
 
 CRITICAL CONTEXT - BE VERY PERMISSIVE:
 - This is a NEWS APP - questions about ANY news topics are LEGITIMATE, even if they mention sensitive subjects
@@ -81,11 +55,11 @@ CRITICAL CONTEXT - BE VERY PERMISSIVE:
 - When in doubt, ALLOW the content - err on the side of permissiveness
 
 Respond ONLY with a JSON object in this exact format:
-{{
+{
   "is_appropriate": true|false,
   "reason": "brief explanation if inappropriate, null if appropriate",
   "severity": "low|medium|high" (only if inappropriate)
-}}
+}
 
 Examples of ALLOWED content (is_appropriate: true):
 - "What happened in the recent election?" 
@@ -102,6 +76,47 @@ Examples of BLOCKED content (is_appropriate: false):
 - Hate speech: "[Discriminatory language targeting groups]"
 - Clearly inappropriate intent: "[Rude/offensive language with intent to be inappropriate]"
 """
+
+
+def moderate_content(
+    user_message: str,
+    api_key: Optional[str] = None,
+    use_llm: bool = True
+) -> Tuple[bool, Optional[str]]:
+    """
+    Moderate user content to detect inappropriate language or queries.
+    
+    Args:
+        user_message: The user's message to check
+        api_key: Optional Gemini API key (will fetch if not provided)
+        use_llm: Whether to use LLM-based moderation (more accurate but slower)
+    
+    Returns:
+        Tuple of (is_appropriate: bool, reason: Optional[str])
+        - If is_appropriate is True, content is safe
+        - If False, reason explains why it was flagged
+    """
+    if not user_message or not user_message.strip():
+        return True, None
+    
+    # Very minimal pattern check - only block obvious, intentional profanity
+    # Most content should go through LLM for context-aware evaluation
+    might_match = not _PROFANITY_NEEDS_ASTERISK or "*" in user_message
+    if might_match and _PROFANITY_RE.search(user_message):
+        logger.info(f"[content_moderation] Blocked message due to obvious profanity (pattern match)")
+        return False, "Your message contains inappropriate language. Please rephrase your question in a respectful way."
+    
+    # Use LLM-based moderation for more nuanced detection
+    if use_llm:
+        try:
+            if not api_key:
+                api_key = get_gemini_api_key()
+            
+            if not api_key:
+                # No API key available, fall back to basic checks
+                return True, None
+            
+            moderation_prompt = _MOD_PROMPT_PRE + user_message.replace('"', '\\"') + _MOD_PROMPT_POST
             
             result = gemini_generate(
                 contents=[{"role": "user", "parts": [moderation_prompt]}],
@@ -111,10 +126,8 @@ Examples of BLOCKED content (is_appropriate: false):
             resp = result.get("text", "")
             
             # Extract JSON from response
-            import json
-            json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
+            data = extract_json_object(resp)
+            if data is not None:
                 is_appropriate = data.get("is_appropriate", True)
                 reason = data.get("reason")
                 
@@ -1,31 +1,80 @@
 import google.generativeai as genai
-from typing import List, Dict, Any, Optional
+from google.generativeai import client as genai_client
+from typing import List, Dict, Any, Optional, Iterator
+from functools import lru_cache
+import asyncio
+import threading
 import time
 
 
-def gemini_generate(
-    contents: List[Dict[str, Any]],
-    system_prompt: str = "",
-    api_key: Optional[str] = None,
-) -> Dict[str, Any]:
-    """Generate content using Gemini API."""
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not set")
+# Guards the SDK's global configuration. Calls run concurrently in worker
+# threads and requests may bring their own key, so configuring a key and
+# binding a model to that key's client must happen as one step.
+_configure_lock = threading.Lock()
+_configured_api_key: Optional[str] = None
+
+
+def _is_bound(model, use_async: bool) -> bool:
+    """True once the model holds its own client(s).
+
+    `_client` / `_async_client` are SDK internals. If a future SDK drops
+    them, this stays False, so `_build_model` keeps configuring the key on
+    every call and the model picks its client lazily, as it did before models
+    were bound here.
+    """
+    if getattr(model, "_client", None) is None:
+        return False
+    return not use_async or getattr(model, "_async_client", None) is not None
+
+
+def _build_model(api_key: str, system_prompt: str = "", use_async: bool = False):
+    """Return a model for this key and system prompt, reusing earlier instances.
+
+    `genai.configure` replaces the SDK's shared clients (and their open
+    connections), so it only runs when the key actually changes. The SDK
+    would otherwise bind a model to whatever client is the global default at
+    its first call, which under concurrency can belong to another caller's
+    key; the client is therefore bound here, while the lock still holds this
+    key as the configured one. Only a model's first use takes the lock, so
+    the async path does not block the event loop in the steady state.
+
+    Args:
+        api_key: Gemini API key the model must call with
+        system_prompt: System instruction for the model
+        use_async: Also bind the asyncio client (call from the event loop)
+    """
+    global _configured_api_key
+    model = _cached_model(api_key, system_prompt)
+    if _is_bound(model, use_async):
+        return model
+    with _configure_lock:
+        if api_key != _configured_api_key:
+            genai.configure(api_key=api_key)
+            _configured_api_key = api_key
+        if getattr(model, "_client", False) is None:
+            model._client = genai_client.get_default_generative_client()
+        if use_async and getattr(model, "_async_client", False) is None:
+            model._async_client = genai_client.get_default_generative_async_client()
+    return model
+
+
+@lru_cache(maxsize=64)
+def _cached_model(api_key: str, system_prompt: str):
+    # Keyed on the API key too: a model keeps the client it was bound to.
 
-    genai.configure(api_key=api_key)
-    
     # Configure model with system instruction if provided
     # Using gemini-1.5-flash for better free tier availability
     if system_prompt:
-        model = genai.GenerativeModel(
+        return genai.GenerativeModel(
             model_name="gemini-2.5-flash",
             system_instruction=system_prompt,
         )
-    else:
-        model = genai.GenerativeModel(
-            model_name="gemini-2.5-flash",
-        )
+    return genai.GenerativeModel(
+        model_name="gemini-2.5-flash",
+    )
+
 
+def _format_contents(contents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     # Convert contents to Gemini format
     # Contents should be a list of dicts with 'role' and 'parts' keys
     # If it's already in the right format, use as-is
@@ -39,6 +88,37 @@ def gemini_generate(
             # Try to extract text from dict if it has a 'text' or 'message' key
             text = content.get("text") or content.get("message") or str(content)
             formatted_contents.append({"role": "user", "parts": [text]})
+    return formatted_contents
+
+
+def _friendly_error(error_msg: str) -> ValueError:
+    is_quota = (
+        "429" in error_msg
+        or "quota" in error_msg.lower()
+        or "quota exceeded" in error_msg.lower()
+    )
+    if is_quota:
+        return ValueError(
+            "Gemini rate limit reached. Please wait a moment and try again. "
+            f"Details: {error_msg[:200]}"
+        )
+    return ValueError(
+        "We hit a temporary issue contacting Gemini. Please try again shortly. "
+        f"Details: {error_msg[:200]}"
+    )
+
+
+def gemini_generate(
+    contents: List[Dict[str, Any]],
+    system_prompt: str = "",
+    api_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Generate content using Gemini API."""
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not set")
+
+    model = _build_model(api_key, system_prompt)
+    formatted_contents = _format_contents(contents)
 
     # Retry strategy: up to 3 attempts with exponential backoff
     max_attempts = 3
@@ -51,11 +131,6 @@ def gemini_generate(
         except Exception as e:
             error_msg = str(e)
             last_error_msg = error_msg
-            is_quota = (
-                "429" in error_msg
-                or "quota" in error_msg.lower()
-                or "quota exceeded" in error_msg.lower()
-            )
             # If not last attempt, wait then retry
             if attempt < max_attempts:
                 # Gentle exponential backoff
@@ -63,13 +138,73 @@ def gemini_generate(
                 time.sleep(delay_seconds)
                 continue
             # On final failure, raise a user-friendly error
-            if is_quota:
-                raise ValueError(
-                    "Gemini rate limit reached. Please wait a moment and try again. "
-                    f"Details: {error_msg[:200]}"
-                )
-            raise ValueError(
-                "We hit a temporary issue contacting Gemini. Please try again shortly. "
-                f"Details: {error_msg[:200]}"
-            )
+            raise _friendly_error(error_msg)
+
+
+async def gemini_generate_async(
+    contents: List[Dict[str, Any]],
+    system_prompt: str = "",
+    api_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Async variant of `gemini_generate` that awaits the SDK's native coroutine.
+
+    Retry and error behaviour mirror `gemini_generate`, with non-blocking backoff.
+    """
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not set")
+
+    model = _build_model(api_key, system_prompt, use_async=True)
+    formatted_contents = _format_contents(contents)
+
+    max_attempts = 3
+    for attempt in range(1, max_attempts + 1):
+        try:
+            response = await model.generate_content_async(formatted_contents)
+            text = response.text if hasattr(response, "text") and response.text else ""
+            return {"text": text, "raw": response}
+        except Exception as e:
+            if attempt < max_attempts:
+                delay_seconds = 0.5 * (2 ** (attempt - 1))
+                await asyncio.sleep(delay_seconds)
+                continue
+            raise _friendly_error(str(e))
+
+
+def gemini_stream(
+    contents: List[Dict[str, Any]],
+    system_prompt: str = "",
+    api_key: Optional[str] = None,
+) -> Iterator[str]:
+    """Stream generated text from the Gemini API chunk by chunk.
+
+    Failures before the first chunk are retried like `gemini_generate`; once
+    text has been yielded the error is raised to the caller instead.
+    """
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not set")
+
+    model = _build_model(api_key, system_prompt)
+    formatted_contents = _format_contents(contents)
+
+    max_attempts = 3
+    for attempt in range(1, max_attempts + 1):
+        started = False
+        try:
+            response = model.generate_content(formatted_contents, stream=True)
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. a bare finish reason)
+                    continue
+                if text:
+                    started = True
+                    yield text
+            return
+        except Exception as e:
+            if not started and attempt < max_attempts:
+                delay_seconds = 0.5 * (2 ** (attempt - 1))
+                time.sleep(delay_seconds)
+                continue
+            raise _friendly_error(str(e))
 
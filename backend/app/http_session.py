@@ -0,0 +1,16 @@
+"""Pooled `requests` sessions for the synchronous upstream API clients."""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def pooled_session(pool_maxsize: int = 20) -> requests.Session:
+    """Return a session that keeps up to `pool_maxsize` connections per host alive.
+
+    The sync clients run on threadpool workers, so a module-level session
+    lets those threads share keep-alive connections instead of paying a TLS
+    handshake per request; size the pool for the number of concurrent callers.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=pool_maxsize))
+    return session
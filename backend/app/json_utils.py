@@ -0,0 +1,35 @@
+"""Parsing helpers for JSON embedded in LLM replies."""
+
+from typing import Any, Dict, Optional
+import json
+
+import orjson
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """Return the first JSON object embedded in an LLM reply, or None.
+
+    Tries the whole (stripped) reply with orjson first, since Gemini usually
+    answers with bare JSON. Otherwise walks each "{" and lets the C decoder's
+    raw_decode parse from there, which handles any nesting depth without
+    regex backtracking.
+    """
+    stripped = text.strip()
+    if stripped.startswith("{") and stripped.endswith("}"):
+        try:
+            data = orjson.loads(stripped)
+            if isinstance(data, dict):
+                return data
+        except orjson.JSONDecodeError:
+            pass
+    start = text.find("{")
+    while start != -1:
+        try:
+            data, _ = _JSON_DECODER.raw_decode(text, start)
+            return data
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+    return None
@@ -1,23 +1,137 @@
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, BackgroundTasks, Depends, Query, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, field_validator
+from typing import Optional, List, Dict, Any, Literal, Tuple, get_args
+from typing_extensions import TypedDict
+import asyncio
+import gzip
+import hashlib
+import logging
 import re
-import json
 import os
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial
+from itertools import islice
+from types import MappingProxyType
 from datetime import datetime, timezone
+import httpx
+import orjson
 
 from .config import get_newsapi_key, get_gemini_api_key, get_env_debug
-from .newsapi_client import fetch_news
+from .newsapi_client import fetch_news_async
+from .gemini import gemini_generate_async
+from .content_moderation import moderate_content
 from .agents import POLLY, FLYNN, PIXEL, CATO, PIZZAZZ, EDWIN, CREDO, GAIA, HAPPY, OMNI, CLASSIFIER
-from .news_helper import get_news_context
+from .news_helper import get_news_context, fetch_relevant_news_async, summarize_news_for_agent, fetch_top_headlines_structured
 from .chart_helper import detect_chart_or_timeline_intent, generate_chart_data, generate_timeline_data
 from .auth import router as auth_router
+from .cache import TTLCache
+from .json_utils import extract_json_object
 from .mongo import get_users_collection, get_mongo_client, get_db, get_chat_sessions_collection
 from .sportsdb_client import fetch_events_day, fetch_past_league_events
 from bson import ObjectId
 
+logger = logging.getLogger(__name__)
+
+
+# Agent metadata appended to model turns in saved history, e.g.
+# "... [Agent: Polly the Parrot]". The inline form is matched against
+# lowercased text.
+_AGENT_META_RE = re.compile(r'\s*\[Agent:\s*[^\]]+\]\s*$', re.IGNORECASE)
+_AGENT_META_INLINE_RE = re.compile(r'\[agent:\s*([^\]]+)\]')
+_USER_PREFIX_RE = re.compile(r'^User:\s*')
+
+
+# Routing keywords. Each category is one precompiled alternation anchored at a
+# word start, so a message is scanned once per category and "ai" no longer
+# matches inside words like "said" (prefixes such as "politic" still match
+# "politics").
+def _keyword_re(words) -> "re.Pattern[str]":
+    return re.compile(r"\b(?:" + "|".join(re.escape(w) for w in words) + ")")
+
+
+_SPORTS_WORDS = ("sport", "game", "team", "player", "score", "football", "basketball", "soccer", "nba", "nfl", "baseball")
+_TECH_WORDS = ("tech", "technology", "ai", "software", "app", "digital", "computer", "code", "programming", "gadget", "device")
+_CIVIC_WORDS = ("politic", "election", "government", "policy", "vote", "civic", "senate", "congress", "president", "democrat", "republican")
+
+_SPORTS_RE = _keyword_re(_SPORTS_WORDS)
+_TECH_RE = _keyword_re(_TECH_WORDS)
+_CIVIC_RE = _keyword_re(_CIVIC_WORDS)
+_DOMAIN_RE = _keyword_re(_SPORTS_WORDS + _TECH_WORDS + _CIVIC_WORDS)
+_ENTERTAINMENT_RE = _keyword_re(("entertainment", "celebrity", "movie", "music", "tv", "show", "pop culture", "actor", "singer"))
+_BUSINESS_RE = _keyword_re(("business", "economy", "market", "stock", "company", "financial", "economic", "trade"))
+_LEGAL_RE = _keyword_re(("crime", "legal", "court", "law", "justice", "trial", "lawsuit", "arrest"))
+_SCIENCE_RE = _keyword_re(("science", "environment", "climate", "research", "discovery", "nature", "sustainability", "planet"))
+_FEEL_GOOD_RE = _keyword_re(("feel-good", "uplifting", "positive", "heartwarming", "inspirational", "good news", "kindness"))
+_HISTORY_RE = _keyword_re(("history", "historical", "past", "trend", "cultural", "tradition", "ancient"))
+_HEADLINES_RE = _keyword_re(("headline", "top news", "top stories", "news today", "today's news"))
+
+# (agent_id, pattern) in precedence order; the first three are the core specialists
+_KEYWORD_ROUTES = (
+    ("flynn", _SPORTS_RE),
+    ("pixel", _TECH_RE),
+    ("cato", _CIVIC_RE),
+    ("pizzazz", _ENTERTAINMENT_RE),
+    ("edwin", _BUSINESS_RE),
+    ("credo", _LEGAL_RE),
+    ("gaia", _SCIENCE_RE),
+    ("happy", _FEEL_GOOD_RE),
+    ("omni", _HISTORY_RE),
+)
+
+# Every category folded into one alternation with a named group per agent, so
+# a single pass over the message finds all matching agents. No keyword is a
+# prefix of another category's keyword, so no category can hide another.
+_ROUTER_RE = re.compile(
+    "|".join(f"(?P<{agent_id}>{pattern.pattern})" for agent_id, pattern in _KEYWORD_ROUTES)
+)
+
+
+def _keyword_agents(message_lower: str) -> frozenset:
+    """Return the ids of every specialist with a keyword in the lowercased message."""
+    return frozenset(m.lastgroup for m in _ROUTER_RE.finditer(message_lower))
+
+
+def _classify(message_lower: str, all_specialists: bool = False) -> str:
+    """Keyword-route a lowercased message to an agent id.
+
+    Args:
+        message_lower: The user message, already lowercased
+        all_specialists: Check every specialist instead of only flynn/pixel/cato
+
+    Returns:
+        The first matching agent id, or "polly" if no keywords match
+    """
+    matches = _keyword_agents(message_lower)
+    if matches:
+        for agent_id, _ in (_KEYWORD_ROUTES if all_specialists else _KEYWORD_ROUTES[:3]):
+            if agent_id in matches:
+                return agent_id
+    return "polly"
+
+
+def _keyword_route(message_lower: str) -> Optional[str]:
+    """Return the one specialist whose keywords match, or None if zero or several do.
+
+    Unlike `_classify`, an ambiguous message is not resolved by precedence, so
+    a non-None result is confident enough to act on without asking Gemini.
+    """
+    matches = _keyword_agents(message_lower)
+    if len(matches) == 1:
+        return next(iter(matches))
+    return None
+
+
+def _is_generic_headlines(message_lower: str) -> bool:
+    """True for headline requests that don't name a sports/tech/politics domain."""
+    return _HEADLINES_RE.search(message_lower) is not None and _DOMAIN_RE.search(message_lower) is None
+
+
+# Paragraph openings that mark JSON or a code block rather than prose
+_NON_PROSE_PREFIXES = ("{", "[", "```")
+
 
 def _clean_visualization_text(text: str) -> str:
     """
@@ -137,11 +251,8 @@ def _clean_visualization_text(text: str) -> str:
     filtered_paragraphs = []
     for para in paragraphs:
         para_lower = para.lower().strip()
-        # Skip paragraphs that are mostly JSON
-        if para_lower.startswith("{") or para_lower.startswith("["):
-            continue
-        # Skip paragraphs that are just code blocks
-        if para_lower.startswith("```"):
+        # Skip paragraphs that are mostly JSON or just code blocks
+        if para_lower.startswith(_NON_PROSE_PREFIXES):
             continue
         # Skip very short paragraphs that are just formatting
         if len(para.strip()) < 10 and any(c in para for c in ["{", "}", "[", "]", "```"]):
@@ -158,7 +269,52 @@ def _clean_visualization_text(text: str) -> str:
     return kept.strip()
 
 
-app = FastAPI(title="News Nest API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client for outbound HTTP, reused across requests (keep-alive)
+    app.state.http = httpx.AsyncClient(
+        timeout=20,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is decoded with orjson instead of the stdlib."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """Route that hands FastAPI an `ORJSONRequest` to parse the body from.
+
+    Chat requests carry the whole conversation history, so decoding is the
+    largest part of request parsing. Pydantic still validates the result.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def orjson_route_handler(request: Request) -> Response:
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return orjson_route_handler
+
+
+app = FastAPI(
+    title="News Nest API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+# Every route declared on the app below decodes JSON bodies with orjson
+app.router.route_class = ORJSONRoute
 
 # Enable CORS for local/mobile development; tighten in production as needed.
 app.add_middleware(
@@ -172,16 +328,15 @@ app.add_middleware(
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
 
 @app.get("/test-news")
-def test_news_fetch(q: str = "sports"):
+async def test_news_fetch(request: Request, q: str = "sports"):
     """Test endpoint to verify news fetching works."""
-    from .news_helper import fetch_relevant_news, summarize_news_for_agent
     
     api_key = get_newsapi_key()
     if not api_key:
         return {"error": "No NewsAPI key found. Set NEWSAPI_KEY in .env file"}
     
     print(f"[test-news] Testing news fetch for query: '{q}'")
-    news_data = fetch_relevant_news(q, days_back=3, max_articles=5)
+    news_data = await fetch_relevant_news_async(request.app.state.http, q, days_back=3, max_articles=5)
     
     if not news_data:
         return {"error": "Failed to fetch news", "api_key_set": bool(api_key)}
@@ -197,8 +352,8 @@ def test_news_fetch(q: str = "sports"):
         }
     
     # Try to summarize
-    gemini_key = get_gemini_api_key()
-    summary = summarize_news_for_agent(news_data, "Polly the Parrot", q, gemini_key)
+    gemini_key = _env_gemini_key()
+    summary = await asyncio.to_thread(summarize_news_for_agent, news_data, "Polly the Parrot", q, gemini_key)
     
     return {
         "success": True,
@@ -219,20 +374,25 @@ def debug_env():
     return get_env_debug()
 
 @app.get("/debug/db")
-def debug_db():
+async def debug_db():
     """Minimal DB connectivity check and users count."""
     try:
         client = get_mongo_client()
         db = get_db()
-        # A very light ping and count
-        client.admin.command("ping")
-        users = get_users_collection()
-        count = users.count_documents({})
+        users = await asyncio.to_thread(get_users_collection)
+        # Ping, count and index listing are independent round trips; run them
+        # concurrently. The estimated count reads collection metadata instead
+        # of scanning.
+        _, count, indexes = await asyncio.gather(
+            asyncio.to_thread(client.admin.command, "ping"),
+            asyncio.to_thread(users.estimated_document_count),
+            asyncio.to_thread(users.index_information),
+        )
         return {
             "connected": True,
             "db_name": db.name,
             "users_count": count,
-            "indexes": users.index_information(),
+            "indexes": indexes,
         }
     except Exception as exc:
         return {"connected": False, "error": str(exc)}
@@ -289,8 +449,85 @@ def get_sports_scoreboard(
         raise HTTPException(status_code=500, detail=f"Error fetching scoreboard: {str(exc)}")
 
 
+# (body, gzip body or None, ETag) for a response that is served many times
+EncodedBody = Tuple[bytes, Optional[bytes], str]
+
+
+def _encode_body(body: bytes, gzip_level: int = 6, min_gzip_size: int = 1024) -> EncodedBody:
+    """Precompute the ETag and (if worthwhile) gzip form of a response body once."""
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    gzipped = gzip.compress(body, gzip_level) if len(body) >= min_gzip_size else None
+    return body, gzipped, etag
+
+
+def _encoded_response(
+    request: Request,
+    encoded: EncodedBody,
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Serve a pre-encoded body, honouring Accept-Encoding and If-None-Match.
+
+    Done per endpoint rather than with GZipMiddleware, which would recompress
+    on every request and buffer the SSE chat stream.
+    """
+    body, gzipped, etag = encoded
+    use_gzip = gzipped is not None and "gzip" in request.headers.get("accept-encoding", "")
+    if use_gzip:
+        # Distinct tag for the gzip representation so caches never mix the two
+        etag = etag[:-1] + '-gz"'
+    out_headers = {"ETag": etag, "Vary": "Accept-Encoding", **(headers or {})}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=out_headers)
+    if use_gzip:
+        out_headers["Content-Encoding"] = "gzip"
+        return Response(content=gzipped, media_type=media_type, headers=out_headers)
+    return Response(content=body, media_type=media_type, headers=out_headers)
+
+
+# NewsAPI boolean operators; only their uppercase forms are operators
+_NEWSAPI_OPERATORS = frozenset(("AND", "OR", "NOT"))
+
+
+def _normalize_query(value: Optional[str]) -> Optional[str]:
+    """Lowercase and collapse whitespace for use in a cache key.
+
+    NewsAPI matching is case-insensitive, but uppercase AND/OR/NOT are
+    operators, so those words keep their case.
+    """
+    if value is None:
+        return None
+    return " ".join(
+        word if word in _NEWSAPI_OPERATORS else word.lower() for word in value.split()
+    ) or None
+
+
+def _normalize_csv(value: Optional[str]) -> Optional[str]:
+    """Sort comma-separated values so equivalent lists share one key."""
+    if not value:
+        return None
+    items = sorted({item.strip().lower() for item in value.split(",") if item.strip()})
+    return ",".join(items) or None
+
+
+# In-flight /news fetches keyed by normalized params; concurrent duplicates
+# await the same upstream call instead of each hitting NewsAPI.
+_NEWS_INFLIGHT: Dict[tuple, "asyncio.Task[EncodedBody]"] = {}
+# NewsAPI results barely change within a minute, so recent responses are
+# served from memory (already serialized and compressed) under the same key.
+_NEWS_CACHE = TTLCache(maxsize=1024, ttl=60)
+_NEWS_CACHE_CONTROL = {"Cache-Control": "public, max-age=60, stale-while-revalidate=300"}
+
+
+async def _fetch_news_encoded(client: httpx.AsyncClient, api_key: str, params: Dict[str, Any]) -> EncodedBody:
+    data = await fetch_news_async(client, api_key, **params)
+    return _encode_body(orjson.dumps(data))
+
+
 @app.get("/news")
-def get_news(
+async def get_news(
+    request: Request,
     q: Optional[str] = Query(None, description="Query string (keywords)"),
     fromDays: Optional[int] = Query(7, ge=0, le=30, description="Days back from today"),
     language: Optional[str] = Query("en"),
@@ -303,34 +540,98 @@ def get_news(
     excludeDomains: Optional[str] = Query(None),
 ):
     api_key = get_newsapi_key()
+    # NewsAPI gets the params as the client sent them; only the cache and
+    # coalescing key is normalized, so equivalent requests share one fetch
+    params = {
+        "q": q,
+        "from_days": fromDays,
+        "language": language,
+        "search_in": searchIn,
+        "sort_by": sortBy,
+        "page_size": pageSize,
+        "page": page,
+        "sources": sources,
+        "domains": domains,
+        "exclude_domains": excludeDomains,
+    }
+    key = (
+        _normalize_query(q),
+        fromDays,
+        _normalize_query(language),
+        _normalize_csv(searchIn),
+        sortBy,
+        pageSize,
+        page,
+        _normalize_csv(sources),
+        _normalize_csv(domains),
+        _normalize_csv(excludeDomains),
+    )
+    cached = _NEWS_CACHE.get(key)
+    if cached is not None:
+        return _encoded_response(request, cached, "application/json", _NEWS_CACHE_CONTROL)
     try:
-        data = fetch_news(
-            api_key,
-            q=q,
-            from_days=fromDays,
-            language=language,
-            search_in=searchIn,
-            sort_by=sortBy,
-            page_size=pageSize,
-            page=page,
-            sources=sources,
-            domains=domains,
-            exclude_domains=excludeDomains,
-        )
-        return data
+        task = _NEWS_INFLIGHT.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                _fetch_news_encoded(request.app.state.http, api_key, params)
+            )
+            _NEWS_INFLIGHT[key] = task
+            task.add_done_callback(lambda _t, key=key: _NEWS_INFLIGHT.pop(key, None))
+        # Shield so one client disconnecting doesn't cancel the fetch for the others
+        encoded = await asyncio.shield(task)
+        _NEWS_CACHE.set(key, encoded)
+        return _encoded_response(request, encoded, "application/json", _NEWS_CACHE_CONTROL)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
 # Agent-related models
+# Must match the keys of AGENTS below
+AgentId = Literal["polly", "flynn", "pixel", "cato", "pizzazz", "edwin", "credo", "gaia", "happy", "omni"]
+
+
+class HistoryItem(TypedDict):
+    """One conversation turn; validated into a plain dict, so handlers index it as before."""
+    role: Literal["user", "model"]
+    parts: List[str]
+
+
 class ChatRequest(BaseModel):
-    agent: str
+    agent: AgentId
     message: str
-    conversation_history: Optional[List[Dict[str, Any]]] = None
+    conversation_history: Optional[List[HistoryItem]] = None
     api_key: Optional[str] = None
     user_name: Optional[str] = None
     parrot_name: Optional[str] = None
 
+    @field_validator("agent", mode="before")
+    @classmethod
+    def _normalize_agent(cls, value: Any) -> Any:
+        # Accept "Polly" / " FLYNN " etc.; unknown ids still fail validation with a 422
+        return value.strip().lower() if isinstance(value, str) else value
+
+    @field_validator("conversation_history", mode="before")
+    @classmethod
+    def _normalize_history(cls, value: Any) -> Any:
+        # Clients send loosely shaped history; normalize it once here instead of
+        # in every handler. Items without role/parts are dropped, "agent" turns
+        # become "model", any other role becomes "user", and parts become strings.
+        if not isinstance(value, list):
+            return value
+        history = []
+        for item in value:
+            if not (isinstance(item, dict) and "role" in item and "parts" in item):
+                continue
+            role = item["role"]
+            if role != "user" and role != "model":
+                role = "model" if role == "agent" else "user"
+            parts = item["parts"]
+            history.append({
+                "role": role,
+                "parts": [str(p) for p in parts] if isinstance(parts, list) else [str(parts)],
+            })
+        return history
+
 
 class ChartDataPoint(BaseModel):
     """A single data point for a chart."""
@@ -408,6 +709,38 @@ class ChatResponse(BaseModel):
     scoreboard: Optional[SportsScoreboardResponse] = None
 
 
+def _chat_payload(
+    agent: str,
+    response: str,
+    *,
+    error: Optional[str] = None,
+    routing_message: Optional[str] = None,
+    routed_from: Optional[str] = None,
+    has_article_reference: Optional[bool] = False,
+    articles: Optional[list] = None,
+    chart: Optional[ChartData] = None,
+    timeline: Optional[TimelineData] = None,
+    scoreboard: Optional[SportsScoreboardResponse] = None,
+) -> Dict[str, Any]:
+    """Build a ChatResponse-shaped dict that can go straight to ORJSONResponse.
+
+    Skips constructing and re-serializing a ChatResponse on every reply; the
+    endpoints keep `response_model=ChatResponse` for the OpenAPI docs only.
+    """
+    return {
+        "agent": agent,
+        "response": response,
+        "error": error,
+        "routing_message": routing_message,
+        "routed_from": routed_from,
+        "has_article_reference": has_article_reference,
+        "articles": articles,
+        "chart": chart.model_dump() if chart is not None else None,
+        "timeline": timeline.model_dump() if timeline is not None else None,
+        "scoreboard": scoreboard.model_dump() if scoreboard is not None else None,
+    }
+
+
 # Agent mapping
 AGENTS = {
     "polly": POLLY,
@@ -421,6 +754,12 @@ AGENTS = {
     "happy": HAPPY,
     "omni": OMNI,
 }
+assert set(get_args(AgentId)) == set(AGENTS), "AgentId is out of sync with AGENTS"
+
+# Precomputed views of AGENTS for hot-path membership checks and lookups
+_AGENT_IDS = frozenset(AGENTS)
+_AGENT_LIST_STR = ", ".join(AGENTS.keys())
+_AGENT_NAMES = {agent_id: agent.name for agent_id, agent in AGENTS.items()}
 
 # Map human-readable agent names to ids
 AGENT_NAME_TO_ID = {
@@ -446,116 +785,206 @@ AGENT_NAME_TO_ID = {
     "omni the owl": "omni",
 }
 
-@app.get("/agents/polly/welcome", response_model=ChatResponse)
-async def polly_welcome(api_key: Optional[str] = None):
-    """Return Polly's first welcome message with today's top headlines (no user message required)."""
-    agent = POLLY
-    key = api_key or get_gemini_api_key()
+# All agent names as one alternation, longest first, so each history message is
+# scanned once instead of once per name (case-insensitively, so callers don't
+# need a lowercased copy; lowercase the match to look it up). The core variant
+# only covers the original four agents: bare names like "happy" are too common
+# in free text to infer the active agent from.
+_AGENT_NAME_RE = re.compile(
+    "|".join(re.escape(n) for n in sorted(AGENT_NAME_TO_ID, key=len, reverse=True)),
+    # ASCII-only case folding: Unicode folding would also match look-alikes
+    # such as "Gooſe", whose .lower() is not a key of AGENT_NAME_TO_ID
+    re.IGNORECASE | re.ASCII,
+)
+_CORE_AGENT_NAME_RE = re.compile("|".join(
+    re.escape(n) for n in sorted(AGENT_NAME_TO_ID, key=len, reverse=True)
+    if AGENT_NAME_TO_ID[n] in ("polly", "flynn", "pixel", "cato")
+))
+
+
+@lru_cache(maxsize=1)
+def _env_gemini_key() -> str:
+    """Server-side Gemini key; the environment is only read once per process."""
+    return get_gemini_api_key()
+
+
+def require_gemini_key(api_key: Optional[str] = None) -> str:
+    """Resolve the Gemini key for a request, preferring a caller-supplied one.
+
+    Usable as a FastAPI dependency (reads the `api_key` query param) or called
+    directly with the key from a JSON body.
+
+    Raises:
+        HTTPException: 400 if neither the request nor the environment has a key
+    """
+    key = api_key or _env_gemini_key()
     if not key:
         raise HTTPException(
             status_code=400,
-            detail="GEMINI_API_KEY not set. Provide it as a query param or set it in .env."
+            detail="GEMINI_API_KEY not set. Provide it in the request or set it in .env file."
         )
+    return key
+
+
+@app.get("/agents/polly/welcome", response_model=ChatResponse)
+async def polly_welcome(key: str = Depends(require_gemini_key)):
+    """Return Polly's first welcome message with today's top headlines (no user message required)."""
+    agent = POLLY
     # Minimal starter content; PollyAgent will inject headlines on first message
     contents: List[Dict[str, Any]] = [{"role": "user", "parts": ["Start"]}]
     try:
-        result = agent.respond(contents=contents, api_key=key, is_first_message=True)
-        return ChatResponse(agent=agent.name, response=result.get("text", ""))
+        result = await asyncio.to_thread(agent.respond, contents=contents, api_key=key, is_first_message=True)
+        return ORJSONResponse(_chat_payload(agent.name, result.get("text", "")))
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+def _build_history_contents(conversation_history: Optional[List[HistoryItem]]) -> List[Dict[str, Any]]:
+    """Convert validated conversation history into Gemini contents.
+
+    Args:
+        conversation_history: History already normalized by ChatRequest
+
+    Returns:
+        List of {"role": "user"|"model", "parts": (...)} dicts with agent metadata
+        stripped. Parts are tuples, which the Gemini SDK accepts like lists.
+    """
+    contents: List[Dict[str, Any]] = []
+    if not conversation_history:
+        return contents
+    append = contents.append
+    for item in conversation_history:
+        # Strip agent metadata from parts before sending to Gemini
+        # Format: "text [Agent: Name]" -> "text". Most parts (every user
+        # turn) have no bracket at all, so skip the regex for those.
+        parts = item["parts"]
+        if len(parts) == 1:
+            # Single part, the usual shape
+            part_str = parts[0]
+            cleaned_parts = (
+                (_AGENT_META_RE.sub('', part_str) if "[" in part_str else part_str).strip(),
+            )
+        else:
+            cleaned_parts = tuple(
+                (_AGENT_META_RE.sub('', p) if "[" in p else p).strip() for p in parts
+            )
+        append({"role": item["role"], "parts": cleaned_parts})
+    return contents
+
+
+def _sse_event(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format one server-sent event. Data is JSON so newlines in text survive framing."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {orjson.dumps(data).decode()}\n\n"
+
+
+# Reply payloads for history-less messages ("hi", "what's the news") repeat a
+# lot and barely change within a few minutes, so they are served from memory.
+_REPLY_CACHE = TTLCache(maxsize=4096, ttl=300)
+
+
+def _reply_cache_key(request: ChatRequest) -> Optional[tuple]:
+    """Cache key for a chat request, or None if the reply depends on history.
+
+    Only surrounding whitespace is ignored; the message keeps its casing, since
+    Gemini may answer "US" and "us" differently.
+    """
+    if request.conversation_history:
+        return None
+    message_digest = hashlib.blake2b(
+        request.message.strip().encode("utf-8"), digest_size=16
+    ).digest()
+    return (request.agent, message_digest, request.user_name, request.parrot_name)
+
+
+# In-flight replies by (cache key, API key digest): a burst of identical
+# history-less messages shares one Gemini call instead of each making its own.
+# (Gemini has no online batch endpoint, so coalescing duplicates is where the
+# saving is.) Only callers using the same key share a call, so nobody is
+# answered with, or billed to, someone else's key.
+_REPLY_INFLIGHT: Dict[tuple, "asyncio.Task[Dict[str, Any]]"] = {}
+
+
 @app.post("/agents/chat", response_model=ChatResponse)
 async def chat_with_agent(request: ChatRequest):
-    # Content moderation: check if user message is appropriate
-    from .content_moderation import moderate_content
-    import logging
-    logger = logging.getLogger(__name__)
+    """Chat with a specific agent."""
+    # Resolve the key first so a keyless request fails the same way whether or
+    # not its reply happens to be cached
+    api_key = require_gemini_key(request.api_key)
+    cache_key = _reply_cache_key(request)
+    if cache_key is None:
+        return ORJSONResponse(await _chat_with_agent(request))
+    
+    # Identical messages have already passed moderation, so a hit skips it too
+    cached = _REPLY_CACHE.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
     
-    is_appropriate, moderation_reason = moderate_content(request.message, api_key=request.api_key)
+    inflight_key = (cache_key, hashlib.blake2b(api_key.encode("utf-8"), digest_size=16).digest())
+    task = _REPLY_INFLIGHT.get(inflight_key)
+    if task is None:
+        task = asyncio.ensure_future(_chat_with_agent(request))
+        _REPLY_INFLIGHT[inflight_key] = task
+        task.add_done_callback(lambda _t, key=inflight_key: _REPLY_INFLIGHT.pop(key, None))
+    # Shield so one client disconnecting doesn't cancel the reply for the others
+    payload = await asyncio.shield(task)
+    _REPLY_CACHE.set(cache_key, payload)
+    return ORJSONResponse(payload)
+
+
+async def _chat_with_agent(request: ChatRequest) -> Dict[str, Any]:
+    # Content moderation: check if user message is appropriate
+    is_appropriate, moderation_reason = await asyncio.to_thread(moderate_content, request.message, api_key=request.api_key)
     if not is_appropriate:
         logger.warning(f"[content_moderation] Blocked inappropriate message from agent '{request.agent}': {request.message[:100]}")
         raise HTTPException(
             status_code=400,
             detail=moderation_reason or "Your message contains inappropriate content. Please rephrase your question in a respectful way."
         )
-    """Chat with a specific agent."""
-    agent_name = request.agent.lower()
-    
-    if agent_name not in AGENTS:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Agent '{request.agent}' not found. Available agents: {', '.join(AGENTS.keys())}"
-        )
-    
+    # ChatRequest has already validated and lowercased the agent id
+    agent_name = request.agent
     agent = AGENTS[agent_name]
-    api_key = request.api_key or get_gemini_api_key()
-    
-    if not api_key:
-        raise HTTPException(
-            status_code=400,
-            detail="GEMINI_API_KEY not set. Provide it in the request or set it in .env file."
-        )
+    api_key = require_gemini_key(request.api_key)
     
     try:
-        # Build conversation history - include previous messages and current message
-        contents = []
+        # Check if we should fetch current news for this message. The lookup
+        # is submitted to the threadpool right away (unlike a to_thread task,
+        # which waits for this coroutine to yield), so the NewsAPI round trip
+        # overlaps the history cleaning below.
+        logger.debug("[chat_with_agent] Checking news context for message: '%s', agent: %s", request.message, agent.name)
+        news_future = asyncio.get_running_loop().run_in_executor(
+            None, partial(get_news_context, request.message, agent.name)
+        )
         
-        # Add conversation history if provided
-        if request.conversation_history:
-            print(f"[chat_with_agent] Received conversation history with {len(request.conversation_history)} items")
-            # Validate and add history messages
-            for item in request.conversation_history:
-                if isinstance(item, dict) and "role" in item and "parts" in item:
-                    # Ensure role is 'user' or 'model'
-                    role = item["role"]
-                    if role not in ["user", "model"]:
-                        # Try to map agent/user to model/user
-                        if role == "agent":
-                            role = "model"
-                        else:
-                            role = "user"
-                    
-                    # Ensure parts is a list
-                    parts = item["parts"]
-                    if not isinstance(parts, list):
-                        parts = [str(parts)]
-                    
-                    # Strip agent metadata from parts before sending to Gemini
-                    # Format: "text [Agent: Name]" -> "text"
-                    cleaned_parts = []
-                    for part in parts:
-                        part_str = str(part)
-                        # Remove [Agent: Name] metadata pattern
-                        cleaned = re.sub(r'\s*\[Agent:\s*[^\]]+\]\s*$', '', part_str, flags=re.IGNORECASE)
-                        cleaned_parts.append(cleaned.strip())
-                    
-                    contents.append({
-                        "role": role,
-                        "parts": cleaned_parts
-                    })
-        else:
-            print(f"[chat_with_agent] No conversation history provided")
+        # Build conversation history - include previous messages and current message
+        try:
+            if request.conversation_history:
+                logger.debug("[chat_with_agent] Received conversation history with %d items", len(request.conversation_history))
+            else:
+                logger.debug("[chat_with_agent] No conversation history provided")
+            contents = _build_history_contents(request.conversation_history)
+        except BaseException:
+            _discard_task(news_future)
+            raise
         
-        # Check if we should fetch current news for this message
-        print(f"[chat_with_agent] Checking news context for message: '{request.message}', agent: {agent.name}")
-        news_context = get_news_context(request.message, agent.name)
+        news_context = await news_future
         
         # Add current message (with news context if available)
         user_message = request.message
         if news_context:
             user_message = user_message + news_context
-            print(f"[chat_with_agent] Added news context to message (length: {len(news_context)} chars)")
+            logger.debug("[chat_with_agent] Added news context to message (length: %d chars)", len(news_context))
         else:
-            print(f"[chat_with_agent] No news context added")
+            logger.debug("[chat_with_agent] No news context added")
         
         contents.append({"role": "user", "parts": [user_message]})
-        print(f"[chat_with_agent] Total conversation context: {len(contents)} messages")
+        logger.debug("[chat_with_agent] Total conversation context: %d messages", len(contents))
         
         # Check if this is the first message (no conversation history)
-        is_first_message = not request.conversation_history or len(request.conversation_history) == 0
+        is_first_message = not request.conversation_history
         
-        result = agent.respond(
+        result = await asyncio.to_thread(
+            agent.respond,
             contents=contents, 
             api_key=api_key, 
             is_first_message=is_first_message,
@@ -564,7 +993,7 @@ async def chat_with_agent(request: ChatRequest):
         )
         
         has_ref = result.get("has_article_reference", False)
-        print(f"[chat_with_agent] Result has_article_reference={has_ref}, result keys: {list(result.keys())}")
+        logger.debug("[chat_with_agent] Result has_article_reference=%s, result keys: %s", has_ref, list(result))
         
         # Check if user wants a chart or timeline visualization
         chart_data = None
@@ -574,17 +1003,17 @@ async def chat_with_agent(request: ChatRequest):
         # Only check for visualizations for agents that support them (Omni, Gaia, Edwin, etc.)
         visualization_agents = ["omni", "gaia", "edwin", "pixel", "cato"]
         if agent_name.lower() in visualization_agents:
-            viz_intent = detect_chart_or_timeline_intent(request.message, agent.name, api_key)
+            viz_intent = await asyncio.to_thread(detect_chart_or_timeline_intent, request.message, agent.name, api_key)
             if viz_intent.get("needs_visualization"):
                 viz_type = viz_intent.get("visualization_type")
                 topic = viz_intent.get("topic", "")
                 
                 if viz_type == "chart":
                     chart_type = viz_intent.get("chart_type", "line")
-                    chart_data_dict = generate_chart_data(topic, chart_type, news_context, api_key)
+                    chart_data_dict = await asyncio.to_thread(generate_chart_data, topic, chart_type, news_context, api_key)
                     if chart_data_dict:
                         chart_data = ChartData(**chart_data_dict)
-                        print(f"[chat_with_agent] Generated {chart_type} chart: {chart_data.title}")
+                        logger.debug("[chat_with_agent] Generated %s chart: %s", chart_type, chart_data.title)
                     else:
                         # Help build data literacy when a chart isn't actually suitable
                         visualization_note = (
@@ -595,10 +1024,10 @@ async def chat_with_agent(request: ChatRequest):
                         )
                 
                 elif viz_type == "timeline":
-                    timeline_data_dict = generate_timeline_data(topic, news_context, api_key)
+                    timeline_data_dict = await asyncio.to_thread(generate_timeline_data, topic, news_context, api_key)
                     if timeline_data_dict:
                         timeline_data = TimelineData(**timeline_data_dict)
-                        print(f"[chat_with_agent] Generated timeline: {timeline_data.title}")
+                        logger.debug("[chat_with_agent] Generated timeline: %s", timeline_data.title)
                     else:
                         visualization_note = (
                             "Note: For this question, a timeline of specific dated events isn't a great fit. "
@@ -623,9 +1052,9 @@ async def chat_with_agent(request: ChatRequest):
             else:
                 response_text = visualization_note
 
-        return ChatResponse(
-            agent=agent_display_name,
-            response=response_text,
+        return _chat_payload(
+            agent_display_name,
+            response_text,
             has_article_reference=has_ref,
             chart=chart_data,
             timeline=timeline_data,
@@ -634,19 +1063,84 @@ async def chat_with_agent(request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+@app.post("/agents/chat/stream")
+async def chat_with_agent_stream(request: ChatRequest):
+    """Chat with a specific agent, streaming the reply as server-sent events.
+
+    Emits `data: {"text": ...}` for each generated chunk, then an `event: done`
+    carrying the agent display name. Errors after the stream has started are
+    sent as `event: error` since the status code is already committed.
+    Visualizations are not generated on this path; use `/agents/chat` for those.
+    """
+    is_appropriate, moderation_reason = await asyncio.to_thread(moderate_content, request.message, api_key=request.api_key)
+    if not is_appropriate:
+        logger.warning(f"[content_moderation] Blocked inappropriate message from agent '{request.agent}': {request.message[:100]}")
+        raise HTTPException(
+            status_code=400,
+            detail=moderation_reason or "Your message contains inappropriate content. Please rephrase your question in a respectful way."
+        )
+    # ChatRequest has already validated and lowercased the agent id
+    agent_name = request.agent
+    agent = AGENTS[agent_name]
+    api_key = require_gemini_key(request.api_key)
+    
+    contents = _build_history_contents(request.conversation_history)
+    news_context = await asyncio.to_thread(get_news_context, request.message, agent.name)
+    user_message = request.message
+    if news_context:
+        user_message = user_message + news_context
+    contents.append({"role": "user", "parts": [user_message]})
+    
+    is_first_message = not request.conversation_history
+    
+    agent_display_name = agent.name
+    if agent_name == "polly" and request.parrot_name:
+        agent_display_name = f"{request.parrot_name} the Parrot"
+    
+    def event_stream():
+        # Sync generator: Starlette iterates it in a worker thread, so the
+        # blocking Gemini stream does not stall the event loop.
+        try:
+            for chunk in agent.respond_stream(
+                contents=contents,
+                api_key=api_key,
+                is_first_message=is_first_message,
+                user_name=request.user_name,
+                parrot_name=request.parrot_name,
+            ):
+                yield _sse_event({"text": chunk})
+        except Exception as exc:
+            yield _sse_event({"detail": str(exc)}, event="error")
+            return
+        yield _sse_event({"agent": agent_display_name}, event="done")
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Agent prompts are static, so the listing is built once at import
+_AGENT_LIST_PAYLOAD = {
+    "agents": [
+        {
+            "id": agent_id,
+            "name": agent.name,
+            "description": agent.cached_system_prompt()[:100] + "..."
+        }
+        for agent_id, agent in AGENTS.items()
+    ]
+}
+
+
 @app.get("/agents/list")
 async def list_agents():
     """List all available agents."""
-    return {
-        "agents": [
-            {
-                "id": agent_id,
-                "name": agent.name,
-                "description": agent.get_system_prompt()[:100] + "..."
-            }
-            for agent_id, agent in AGENTS.items()
-        ]
-    }
+    return ORJSONResponse(
+        content=_AGENT_LIST_PAYLOAD,
+        headers={"Cache-Control": "public, max-age=300"},
+    )
 
 
 class RouteRequest(BaseModel):
@@ -662,19 +1156,10 @@ class RouteResponse(BaseModel):
     alternative_agents: Optional[List[str]] = None
 
 
-@app.post("/agents/route", response_model=RouteResponse)
-async def route_message(request: RouteRequest):
-    """Automatically route a message to the most appropriate agent based on topic detection."""
-    api_key = request.api_key or get_gemini_api_key()
-    
-    if not api_key:
-        raise HTTPException(
-            status_code=400,
-            detail="GEMINI_API_KEY not set. Provide it in the request or set it in .env file."
-        )
-    
-    # Use Polly to analyze and suggest routing
-    routing_prompt = f"""Analyze this user message and determine which specialist agent should handle it.
+# Routing prompts keep all static instructions first and the per-request
+# context last, so repeated calls share an identical prefix that Gemini's
+# implicit prompt caching can reuse.
+_ROUTE_PROMPT_PREFIX = """Analyze this user message and determine which specialist agent should handle it.
 
 Available agents:
 - polly (Polly the Parrot): General news, headlines, greetings, general questions
@@ -688,63 +1173,144 @@ Available agents:
 - happy (Happy the Hummingbird): Feel-good stories, uplifting news, positive stories, human interest, inspirational
 - omni (Omni the Owl): History, historical trends, cultural analysis, connecting past to present
 
-User message: "{request.message}"
-
 Respond ONLY with a JSON object in this exact format:
-{{
+{
     "suggested_agent": "agent_id (polly/flynn/pixel/cato/pizzazz/edwin/credo/gaia/happy/omni)",
     "confidence": "high/medium/low",
     "reasoning": "brief explanation why this agent is best",
     "alternative_agents": ["other_agent_id_if_relevant"]
-}}"""
+}
+"""
 
-    try:
-        from .gemini import gemini_generate
+_ROUTE_ONLY_PROMPT_PREFIX = """You are an intelligent router for a news conversation system. Analyze the user's message and the conversation context to determine which specialist agent should handle it.
+
+Available agents:
+- polly (Polly the Parrot): General news, headlines, greetings, general questions, non-specialized topics
+- flynn (Flynn the Falcon): Sports, games, athletics, scores, sports analysis, sports news, teams, players
+- pixel (Pixel the Pigeon): Technology, gadgets, AI, software, tech innovations, coding, digital products, tech news
+- cato (Cato the Crane): Politics, elections, government, policies, civic affairs, political news, governance
+- pizzazz (Pizzazz the Peacock): Entertainment, pop culture, celebrities, lifestyle, movies, music, TV shows, entertainment news
+- edwin (Edwin the Eagle): Business, economy, markets, companies, financial news, economic trends, stocks, trade
+- credo (Credo the Crow): Crime, legal matters, justice, law, legal news, court cases, trials, lawsuits
+- gaia (Gaia the Goose): Science, environment, climate, discoveries, research, nature, sustainability, environmental news
+- happy (Happy the Hummingbird): Feel-good stories, uplifting news, positive stories, human interest, inspirational news
+- omni (Omni the Owl): History, historical trends, cultural analysis, connecting past to present, historical context
+
+IMPORTANT ROUTING RULES:
+1. Detect ANY topic shift to a specialized domain - even subtle ones
+2. If the user asks about sports (even indirectly), route to flynn
+3. If the user asks about technology/tech (even indirectly), route to pixel
+4. If the user asks about politics/government (even indirectly), route to cato
+5. If the user asks about entertainment/pop culture (even indirectly), route to pizzazz
+6. If the user asks about business/economy (even indirectly), route to edwin
+7. If the user asks about crime/legal matters (even indirectly), route to credo
+8. If the user asks about science/environment (even indirectly), route to gaia
+9. If the user asks for feel-good/uplifting news (even indirectly), route to happy
+10. If the user asks about history/historical context (even indirectly), route to omni
+11. If continuing the same topic with the current specialist, stay with that specialist
+12. If the topic is general news or unclear, route to polly
+
+Respond ONLY with a JSON object in this exact format:
+{
+    "suggested_agent": "agent_id (must be one of: polly/flynn/pixel/cato/pizzazz/edwin/credo/gaia/happy/omni)",
+    "confidence": "high/medium/low",
+    "reasoning": "brief one-sentence explanation",
+    "needs_routing": true/false,
+    "topic_change": true/false
+}
+"""
+
+# Core specialists a generic "headlines" request sticks with
+_HEADLINE_SPECIALISTS = frozenset(("flynn", "pixel", "cato"))
+
+# Read-only "stay with this agent" route-only results, one per agent
+_NO_ROUTE_RESPONSES = {
+    agent_id: MappingProxyType({"needs_routing": False, "routing_message": None, "target_agent": agent_id})
+    for agent_id in AGENTS
+}
+
+
+def _no_route(agent_id: str) -> Dict[str, Any]:
+    """Route-only result for staying with `agent_id`, as a fresh dict for the caller."""
+    return dict(_NO_ROUTE_RESPONSES[agent_id])
+
+
+# Announcements for a clear topic change; other specialists get a generic one
+_ROUTING_MESSAGES = {
+    "flynn": "This sounds like something Flynn the Falcon can help you with! 🦅 He's our sports specialist—let me get him for you.",
+    "pixel": "This is right up Pixel the Pigeon's alley! 🐦 They're our tech expert—connecting you now.",
+    "cato": "Cato the Crane would be perfect for this! 🦩 They specialize in politics and civics—routing you there now.",
+}
+
+
+# Parsed Gemini routing decisions keyed by (endpoint, current agent, message,
+# conversation context digest).
+# Chat UIs resend the same short messages often (retries, "headlines", ...).
+_ROUTE_CACHE = TTLCache(maxsize=4096, ttl=600)
+
+
+def _route_cache_key(kind: str, message: str, current_agent_id: Optional[str], context: str = "") -> tuple:
+    """Cache key for a routing decision.
+
+    Any conversation context that went into the prompt is part of the key
+    (as a digest), so a context-dependent message like "tell me more" is
+    never answered with a decision made for someone else's conversation.
+    """
+    context_digest = hashlib.blake2b(context.encode("utf-8"), digest_size=16).digest() if context else b""
+    return (kind, current_agent_id, message.strip().lower()[:200], context_digest)
+
+
+async def _cached_routing_decision(cache_key: tuple, routing_prompt: str, api_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Ask Gemini for a routing decision, reusing a recent answer for the same key.
+    
+    Only replies that parse as JSON are cached, so unparseable ones still fall
+    through to the keyword fallback every time.
+    """
+    routing_data = _ROUTE_CACHE.get(cache_key)
+    if routing_data is None:
         contents = [{"role": "user", "parts": [routing_prompt]}]
-        result = gemini_generate(contents=contents, api_key=api_key)
-        response_text = result.get("text", "")
-        
-        # Try to extract JSON from response
-        import json
-        import re
-        
-        # Find JSON in the response (handle cases where there's extra text)
-        json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', response_text, re.DOTALL)
-        if json_match:
-            routing_data = json.loads(json_match.group())
+        result = await gemini_generate_async(contents=contents, api_key=api_key)
+        routing_data = extract_json_object(result.get("text", ""))
+        if routing_data is not None:
+            _ROUTE_CACHE.set(cache_key, routing_data)
+    return routing_data
+
+
+def _keyword_route_response(agent_id: str) -> ORJSONResponse:
+    return ORJSONResponse({
+        "suggested_agent": agent_id,
+        "agent_name": _AGENT_NAMES[agent_id],
+        "confidence": "medium",
+        "reasoning": "Keyword-based routing fallback",
+        "alternative_agents": None,
+    })
+
+
+@app.post("/agents/route", response_model=RouteResponse)
+async def route_message(request: RouteRequest):
+    """Automatically route a message to the most appropriate agent based on topic detection."""
+    api_key = require_gemini_key(request.api_key)
+    
+    # A keyword hit always overrides Gemini's suggestion, so don't ask Gemini at all
+    keyword_agent_id = _classify(request.message.lower(), all_specialists=True)
+    if keyword_agent_id != "polly":
+        return _keyword_route_response(keyword_agent_id)
+    
+    # Use Polly to analyze and suggest routing
+    routing_prompt = f'{_ROUTE_PROMPT_PREFIX}\nUser message: "{request.message}"'
+
+    try:
+        cache_key = _route_cache_key("route", request.message, None)
+        routing_data = await _cached_routing_decision(cache_key, routing_prompt, api_key)
+        if routing_data is not None:
             suggested_agent_id = routing_data.get("suggested_agent", "polly").lower()
             
             # Validate the suggested agent exists
-            if suggested_agent_id not in AGENTS:
+            if suggested_agent_id not in _AGENT_IDS:
                 suggested_agent_id = "polly"
             
-            # Fallback: simple keyword-based routing
-            message_lower = request.message.lower()
-            if any(word in message_lower for word in ["sport", "game", "team", "player", "score", "football", "basketball", "soccer"]):
-                suggested_agent_id = "flynn"
-            elif any(word in message_lower for word in ["tech", "technology", "ai", "software", "app", "digital", "computer", "code"]):
-                suggested_agent_id = "pixel"
-            elif any(word in message_lower for word in ["politic", "election", "government", "policy", "vote", "civic", "senate", "congress"]):
-                suggested_agent_id = "cato"
-            elif any(word in message_lower for word in ["entertainment", "celebrity", "movie", "music", "tv", "show", "pop culture", "celebrity", "actor", "singer"]):
-                suggested_agent_id = "pizzazz"
-            elif any(word in message_lower for word in ["business", "economy", "market", "stock", "company", "financial", "economic", "trade"]):
-                suggested_agent_id = "edwin"
-            elif any(word in message_lower for word in ["crime", "legal", "court", "law", "justice", "trial", "lawsuit", "arrest"]):
-                suggested_agent_id = "credo"
-            elif any(word in message_lower for word in ["science", "environment", "climate", "research", "discovery", "nature", "sustainability", "planet"]):
-                suggested_agent_id = "gaia"
-            elif any(word in message_lower for word in ["feel-good", "uplifting", "positive", "heartwarming", "inspirational", "good news", "kindness"]):
-                suggested_agent_id = "happy"
-            elif any(word in message_lower for word in ["history", "historical", "past", "trend", "cultural", "tradition", "ancient"]):
-                suggested_agent_id = "omni"
-            
-            return RouteResponse(
-                suggested_agent=suggested_agent_id,
-                agent_name=AGENTS[suggested_agent_id].name,
-                confidence="medium",
-                reasoning="Keyword-based routing fallback"
-            )
+            return _keyword_route_response(suggested_agent_id)
             
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Error routing message: {str(exc)}")
@@ -757,20 +1323,12 @@ def detect_current_agent_from_history(conversation_history: Optional[List[Dict[s
     
     # Look for agent names in the conversation history
     # Agent names may appear in model responses (e.g., "Polly the Parrot: ..." or just in content)
-    agent_name_to_id = {
-        "polly": "polly",
-        "polly the parrot": "polly",
-        "flynn": "flynn",
-        "flynn the falcon": "flynn",
-        "pixel": "pixel",
-        "pixel the pigeon": "pixel",
-        "cato": "cato",
-        "cato the crane": "cato",
-    }
     
     # Check last few messages for agent mentions
     # Look at the last model response to see which agent was talking
-    for item in reversed(conversation_history[-10:]):  # Check last 10 messages
+    n = len(conversation_history)
+    for i in range(n - 1, max(n - 11, -1), -1):  # Check last 10 messages, newest first
+        item = conversation_history[i]
         if isinstance(item, dict) and item.get("role") == "model":
             parts = item.get("parts", [])
             if parts:
@@ -779,43 +1337,40 @@ def detect_current_agent_from_history(conversation_history: Optional[List[Dict[s
                 
                 # Check if agent name appears in metadata format (e.g., "[Agent: Polly the Parrot]")
                 # This is how we encode agent names in conversation history
-                agent_metadata_pattern = r'\[agent:\s*([^\]]+)\]'
-                match = re.search(agent_metadata_pattern, text_lower)
+                match = _AGENT_META_INLINE_RE.search(text_lower)
                 if match:
-                    agent_name_found = match.group(1).strip()
-                    for agent_name, agent_id in agent_name_to_id.items():
-                        if agent_name in agent_name_found.lower():
-                            return agent_id
+                    name_match = _AGENT_NAME_RE.search(match.group(1))
+                    if name_match:
+                        return AGENT_NAME_TO_ID[name_match.group(0)]
                 
-                # Check if agent name appears at start (e.g., "Polly the Parrot: ...")
-                for agent_name, agent_id in agent_name_to_id.items():
-                    if text_lower.startswith(agent_name.lower() + ":") or text_lower.startswith(agent_name.lower() + " "):
-                        return agent_id
-                
-                # Also check if agent name appears anywhere in the response
-                for agent_name, agent_id in agent_name_to_id.items():
-                    if agent_name in text_lower:
-                        return agent_id
+                # Otherwise take the first agent name in the response; a name at
+                # the start (e.g., "Polly the Parrot: ...") is naturally found first
+                name_match = _CORE_AGENT_NAME_RE.search(text_lower)
+                if name_match:
+                    return AGENT_NAME_TO_ID[name_match.group(0)]
     
     # Fallback: use keyword detection on last few messages
     # Look at recent user messages to infer which agent they're talking to
-    recent_user_messages = [item for item in conversation_history[-6:] if isinstance(item, dict) and item.get("role") == "user"]
+    last_user_msg = next(
+        (
+            conversation_history[i]
+            for i in range(n - 1, max(n - 7, -1), -1)
+            if isinstance(conversation_history[i], dict) and conversation_history[i].get("role") == "user"
+        ),
+        None,
+    )
     
-    if recent_user_messages:
+    if last_user_msg is not None:
         # Check the most recent user message
-        last_user_msg = recent_user_messages[-1]
         parts = last_user_msg.get("parts", [])
         if parts:
             text = " ".join(parts) if isinstance(parts, list) else str(parts)
             text_lower = text.lower()
             
             # Quick keyword-based detection
-            if any(word in text_lower for word in ["sport", "game", "team", "player", "score", "football", "basketball", "soccer"]):
-                return "flynn"
-            elif any(word in text_lower for word in ["tech", "technology", "ai", "software", "app", "digital", "computer", "code"]):
-                return "pixel"
-            elif any(word in text_lower for word in ["politic", "election", "government", "policy", "vote", "civic"]):
-                return "cato"
+            keyword_agent_id = _classify(text_lower)
+            if keyword_agent_id != "polly":
+                return keyword_agent_id
     
     return None
 
@@ -827,65 +1382,69 @@ class SaveChatRequest(BaseModel):
     session_id: Optional[str] = None  # If provided, update existing session instead of creating new one
 
 
-def extract_birds_from_history(history: List[Dict[str, Any]]) -> List[str]:
-    """Extract agent IDs involved in the conversation from history parts metadata."""
+def _scan_history(history: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+    """
+    Walk a saved chat once, collecting the agents involved and a transcript for titling.
+    
+    Args:
+        history: Items like { role: 'user'|'model', parts: [text] }
+    
+    Returns:
+        (sorted agent ids involved, "Role: text" lines for the last ~12 entries)
+    """
     birds: set[str] = set()
-    # Scan all model messages and look for agent tags or names
-    for item in history:
+    lines: List[str] = []
+    title_start = len(history) - 12
+    for index, item in enumerate(history):
         if not isinstance(item, dict):
             continue
-        role = item.get("role")
-        parts = item.get("parts") or []
-        if role != "model":
-            continue
-        text = " ".join([str(p) for p in parts]).lower()
-        # Metadata pattern "[Agent: Name]"
-        meta_match = re.search(r'\[agent:\s*([^\]]+)\]', text)
-        if meta_match:
-            name = meta_match.group(1).strip().lower()
-            for human, agent_id in AGENT_NAME_TO_ID.items():
-                if human in name:
-                    birds.add(agent_id)
-        # Also check plain names
-        for human, agent_id in AGENT_NAME_TO_ID.items():
-            if human in text:
-                birds.add(agent_id)
+        # Scan model messages for agent names, including "[Agent: Name]" metadata,
+        # part by part; stop looking once every agent has been seen
+        if item.get("role") == "model" and len(birds) < len(AGENTS):
+            for part in item.get("parts") or []:
+                for name_match in _AGENT_NAME_RE.finditer(str(part)):
+                    birds.add(AGENT_NAME_TO_ID[name_match.group(0).lower()])
+        # Build a compact transcript snippet from the most recent entries
+        if index >= title_start and "role" in item and "parts" in item:
+            text = " ".join([str(p) for p in (item["parts"] or [])])
+            role = "User" if item["role"] == "user" else "Assistant"
+            # Strip metadata
+            if "[" in text:
+                text = _AGENT_META_RE.sub('', text)
+            # Truncate long lines
+            if len(text) > 200:
+                text = text[:200] + "..."
+            lines.append(f"{role}: {text}")
     # Always include polly if nothing detected (host)
     if not birds:
         birds.add("polly")
-    return sorted(list(birds))
+    return sorted(birds), lines
+
 
+def _heuristic_chat_title(lines: List[str]) -> str:
+    """First user line of the transcript, or a generic title."""
+    first_user = next((_USER_PREFIX_RE.sub('', l) for l in lines if l.startswith("User:")), "")
+    simple = first_user.strip()[:60] if first_user else "News Nest Conversation"
+    return simple if simple else "News Nest Conversation"
 
-def generate_chat_title(history: List[Dict[str, Any]], parrot_name: Optional[str] = None) -> str:
+
+async def generate_chat_title(lines: List[str], parrot_name: Optional[str] = None) -> str:
     """
     Use Gemini to generate a concise, descriptive title for the chat.
     Falls back to a heuristic if no API key or on error.
+    
+    Args:
+        lines: "Role: text" transcript lines, as built by `_scan_history`
+        parrot_name: Optional user-chosen name for the host parrot
     """
-    api_key = get_gemini_api_key()
-    # Build a compact transcript snippet (last ~12 entries) for titling
-    recent = history[-12:] if len(history) > 12 else history
-    lines: List[str] = []
-    for item in recent:
-        if not isinstance(item, dict) or "role" not in item or "parts" not in item:
-            continue
-        role = "User" if item["role"] == "user" else "Assistant"
-        text = " ".join([str(p) for p in (item["parts"] or [])])
-        # Strip metadata
-        text = re.sub(r'\s*\[Agent:\s*[^\]]+\]\s*$', '', text, flags=re.IGNORECASE)
-        # Truncate long lines
-        if len(text) > 200:
-            text = text[:200] + "..."
-        lines.append(f"{role}: {text}")
+    api_key = _env_gemini_key()
     transcript = "\n".join(lines)[:2000]  # hard cap
 
     if not api_key:
         # Heuristic fallback: first user line or generic
-        first_user = next((re.sub(r'^User:\s*', '', l) for l in lines if l.startswith("User:")), "")
-        simple = first_user.strip()[:60] if first_user else "News Nest Conversation"
-        return simple if simple else "News Nest Conversation"
+        return _heuristic_chat_title(lines)
 
     try:
-        from .gemini import gemini_generate
         system_prompt = (
             "You create short, descriptive chat titles for a conversation between a user "
             f"and a news assistant{' named ' + parrot_name if parrot_name else ''}. "
@@ -896,7 +1455,7 @@ def generate_chat_title(history: List[Dict[str, Any]], parrot_name: Optional[str
             "- Avoid generic words like 'Chat', 'Conversation'\n"
         )
         user_prompt = f"Create a title for this conversation:\n\n{transcript}\n\nTitle:"
-        result = gemini_generate(contents=[{"role": "user", "parts": [user_prompt]}], system_prompt=system_prompt, api_key=api_key)
+        result = await gemini_generate_async(contents=[{"role": "user", "parts": [user_prompt]}], system_prompt=system_prompt, api_key=api_key)
         title = (result.get("text") or "").strip().splitlines()[0]
         # Clean title
         title = title.strip().strip('"').strip("'")
@@ -908,17 +1467,49 @@ def generate_chat_title(history: List[Dict[str, Any]], parrot_name: Optional[str
         return title
     except Exception:
         # Fallback on error: simple heuristic
-        first_user = next((re.sub(r'^User:\s*', '', l) for l in lines if l.startswith("User:")), "")
-        simple = first_user.strip()[:60] if first_user else "News Nest Conversation"
-        return simple if simple else "News Nest Conversation"
+        return _heuristic_chat_title(lines)
+
+
+async def _update_chat_title(
+    session_oid: ObjectId,
+    email: str,
+    lines: List[str],
+    parrot_name: Optional[str],
+    provisional_title: str,
+    saved_at: datetime,
+) -> None:
+    """
+    Replace a saved session's provisional title with a Gemini-generated one.
+    
+    Runs after the save response has been sent. The update only applies while
+    the session still carries the provisional title and the `updated_at` of
+    the save that scheduled it, so neither a rename nor a newer save (whose
+    own title task may finish first) is overwritten by a stale result.
+    """
+    try:
+        title = await generate_chat_title(lines, parrot_name=parrot_name)
+        if title == provisional_title:
+            return
+        coll = get_chat_sessions_collection()
+        await asyncio.to_thread(
+            coll.update_one,
+            {"_id": session_oid, "email": email, "title": provisional_title, "updated_at": saved_at},
+            {"$set": {"title": title}},
+        )
+    except Exception as e:
+        logger.warning("[save_chat] Failed to update title for %s: %s", session_oid, e)
 
 
 @app.post("/chats/save")
-def save_chat(payload: SaveChatRequest):
+async def save_chat(payload: SaveChatRequest, background_tasks: BackgroundTasks):
     """
     Persist a chat session with a descriptive title and involved birds.
     'history' should be a list of items like { role: 'user'|'model', parts: [text] }.
     If session_id is provided, updates the existing session; otherwise creates a new one.
+    
+    The session is stored with a provisional title and the response is sent
+    right away; the Gemini-generated title is written in the background, so
+    clients pick it up on their next /chats/history fetch.
     """
     email = (payload.email or "").strip().lower()
     if not email:
@@ -930,19 +1521,20 @@ def save_chat(payload: SaveChatRequest):
     coll = get_chat_sessions_collection()
     now = datetime.now(timezone.utc)
     
-    # Generate title and birds
-    birds = extract_birds_from_history(history)
-    title = generate_chat_title(history, parrot_name=payload.parrot_name)
+    # Birds now, descriptive title later
+    birds, title_lines = _scan_history(history)
+    title = _heuristic_chat_title(title_lines)
     
     # If session_id is provided, update existing session
     if payload.session_id:
         try:
-            from bson import ObjectId
             session_oid = ObjectId(payload.session_id)
             # Verify the session belongs to this user
-            existing = coll.find_one({"_id": session_oid, "email": email})
+            existing = await asyncio.to_thread(coll.find_one, {"_id": session_oid, "email": email})
             if not existing:
                 raise HTTPException(status_code=404, detail="Chat session not found or access denied.")
+            # Keep the current title until the new one is ready
+            title = existing.get("title") or title
             
             # Update the existing session
             update_doc = {
@@ -953,14 +1545,15 @@ def save_chat(payload: SaveChatRequest):
                     "updated_at": now,
                 }
             }
-            coll.update_one({"_id": session_oid, "email": email}, update_doc)
+            await asyncio.to_thread(coll.update_one, {"_id": session_oid, "email": email}, update_doc)
+            background_tasks.add_task(_update_chat_title, session_oid, email, title_lines, payload.parrot_name, title, now)
             
-            return {
+            return ORJSONResponse({
                 "success": True,
                 "id": payload.session_id,
                 "title": title,
                 "birds": birds,
-            }
+            })
         except Exception as e:
             # If ObjectId is invalid or update fails, fall through to create new session
             if isinstance(e, HTTPException):
@@ -977,13 +1570,18 @@ def save_chat(payload: SaveChatRequest):
         "created_at": now,
         "updated_at": now,
     }
-    result = coll.insert_one(doc)
-    return {
+    result = await asyncio.to_thread(coll.insert_one, doc)
+    background_tasks.add_task(_update_chat_title, result.inserted_id, email, title_lines, payload.parrot_name, title, now)
+    return ORJSONResponse({
         "success": True,
         "id": str(result.inserted_id),
         "title": title,
         "birds": birds,
-    }
+    })
+
+
+# Only the fields the history list shows; `_id` is always returned
+_CHAT_HISTORY_PROJECTION = {"title": 1, "birds": 1, "updated_at": 1, "created_at": 1}
 
 
 @app.get("/chats/history")
@@ -993,7 +1591,8 @@ def get_chat_history(email: str):
     if not normalized:
         raise HTTPException(status_code=400, detail="Email is required.")
     coll = get_chat_sessions_collection()
-    cursor = coll.find({"email": normalized}, {"messages": 0}).sort("updated_at", -1)
+    # Served by the (email, updated_at) index walked in reverse, so no in-memory sort
+    cursor = coll.find({"email": normalized}, _CHAT_HISTORY_PROJECTION).sort("updated_at", -1)
     sessions = []
     for doc in cursor:
         sessions.append({
@@ -1003,7 +1602,7 @@ def get_chat_history(email: str):
             "updated_at": doc.get("updated_at").isoformat() if doc.get("updated_at") else None,
             "created_at": doc.get("created_at").isoformat() if doc.get("created_at") else None,
         })
-    return {"sessions": sessions}
+    return ORJSONResponse({"sessions": sessions})
 
 
 @app.get("/chats/session")
@@ -1022,24 +1621,55 @@ def get_chat_session(id: str, email: str):
         raise HTTPException(status_code=404, detail="Chat not found.")
     # Return messages as saved, plus basic metadata
     messages = doc.get("messages") or []
-    return {
+    return ORJSONResponse({
         "id": str(doc.get("_id")),
         "title": doc.get("title") or "Conversation",
         "birds": doc.get("birds") or [],
         "messages": messages,
         "updated_at": doc.get("updated_at").isoformat() if doc.get("updated_at") else None,
         "created_at": doc.get("created_at").isoformat() if doc.get("created_at") else None,
-    }
+    })
+
+
 @app.post("/agents/route-only")
 async def route_only(request: ChatRequest):
     """Smart routing endpoint using Gemini API to detect topic changes and route appropriately."""
-    api_key = request.api_key or get_gemini_api_key()
+    return ORJSONResponse(await _route_only(request))
+
+
+def _keyword_fallback_route(message: str, current_agent_id: Optional[str]) -> Dict[str, Any]:
+    """Route-only result from keywords alone, for when the Gemini router fails.
+
+    Args:
+        message: The user message
+        current_agent_id: Agent the conversation is currently with, if known
+
+    Returns:
+        Route-only response dict; switches to another specialist are silent
+    """
+    message_lower = message.lower()
     
-    if not api_key:
-        raise HTTPException(
-            status_code=400,
-            detail="GEMINI_API_KEY not set. Provide it in the request or set it in .env file."
-        )
+    # Stick with current specialist on generic "headlines"
+    if current_agent_id in _HEADLINE_SPECIALISTS and _is_generic_headlines(message_lower):
+        suggested_agent_id = current_agent_id
+    else:
+        suggested_agent_id = _classify(message_lower)
+    
+    # Already talking to this agent, or nothing specialist-specific
+    if suggested_agent_id == current_agent_id or suggested_agent_id == "polly":
+        return _no_route(suggested_agent_id)
+    
+    # Different agent - silent routing
+    return {
+        "needs_routing": True,
+        "routing_message": None,  # Silent routing for better UX
+        "target_agent": suggested_agent_id,
+        "target_agent_name": _AGENT_NAMES[suggested_agent_id]
+    }
+
+
+async def _route_only(request: ChatRequest) -> Dict[str, Any]:
+    api_key = require_gemini_key(request.api_key)
     
     # Detect current agent from conversation history
     current_agent_id = detect_current_agent_from_history(request.conversation_history)
@@ -1048,16 +1678,22 @@ async def route_only(request: ChatRequest):
     if not current_agent_id:
         try:
             candidate = (request.agent or "").lower()
-            if candidate in AGENTS:
+            if candidate in _AGENT_IDS:
                 current_agent_id = candidate
         except Exception:
             current_agent_id = None
     
+    # Already with the one specialist the keywords point at: nothing to route
+    if current_agent_id is not None and _keyword_route(request.message.lower()) == current_agent_id:
+        return _no_route(current_agent_id)
+    
     # Build context for routing decision
     conversation_context = ""
     if request.conversation_history and len(request.conversation_history) > 0:
         # Get last few messages for context (last 3-4 exchanges)
-        recent_messages = request.conversation_history[-6:]  # Last 6 items (3 exchanges)
+        history = request.conversation_history
+        # Last 6 items (3 exchanges), without copying them into a new list
+        recent_messages = islice(history, max(0, len(history) - 6), None)
         context_parts = []
         for item in recent_messages:
             if isinstance(item, dict) and "role" in item and "parts" in item:
@@ -1066,98 +1702,40 @@ async def route_only(request: ChatRequest):
                     parts = [str(parts)]
                 # Strip agent metadata
                 text = " ".join(str(p) for p in parts)
-                text = re.sub(r'\s*\[Agent:\s*[^\]]+\]\s*$', '', text, flags=re.IGNORECASE)
+                if "[" in text:
+                    text = _AGENT_META_RE.sub('', text)
                 role = "User" if item["role"] == "user" else "Assistant"
                 context_parts.append(f"{role}: {text.strip()}")
         if context_parts:
             conversation_context = "\n".join(context_parts)
     
     # Use Gemini API for intelligent routing based on topic detection
-    routing_prompt = f"""You are an intelligent router for a news conversation system. Analyze the user's message and the conversation context to determine which specialist agent should handle it.
-
-Available agents:
-- polly (Polly the Parrot): General news, headlines, greetings, general questions, non-specialized topics
-- flynn (Flynn the Falcon): Sports, games, athletics, scores, sports analysis, sports news, teams, players
-- pixel (Pixel the Pigeon): Technology, gadgets, AI, software, tech innovations, coding, digital products, tech news
-- cato (Cato the Crane): Politics, elections, government, policies, civic affairs, political news, governance
-- pizzazz (Pizzazz the Peacock): Entertainment, pop culture, celebrities, lifestyle, movies, music, TV shows, entertainment news
-- edwin (Edwin the Eagle): Business, economy, markets, companies, financial news, economic trends, stocks, trade
-- credo (Credo the Crow): Crime, legal matters, justice, law, legal news, court cases, trials, lawsuits
-- gaia (Gaia the Goose): Science, environment, climate, discoveries, research, nature, sustainability, environmental news
-- happy (Happy the Hummingbird): Feel-good stories, uplifting news, positive stories, human interest, inspirational news
-- omni (Omni the Owl): History, historical trends, cultural analysis, connecting past to present, historical context
-
-Current conversation context:
-{conversation_context if conversation_context else "This is the start of the conversation."}
-
-Current message: "{request.message}"
-
-IMPORTANT ROUTING RULES:
-1. Detect ANY topic shift to a specialized domain - even subtle ones
-2. If the user asks about sports (even indirectly), route to flynn
-3. If the user asks about technology/tech (even indirectly), route to pixel
-4. If the user asks about politics/government (even indirectly), route to cato
-5. If the user asks about entertainment/pop culture (even indirectly), route to pizzazz
-6. If the user asks about business/economy (even indirectly), route to edwin
-7. If the user asks about crime/legal matters (even indirectly), route to credo
-8. If the user asks about science/environment (even indirectly), route to gaia
-9. If the user asks for feel-good/uplifting news (even indirectly), route to happy
-10. If the user asks about history/historical context (even indirectly), route to omni
-11. If continuing the same topic with the current specialist, stay with that specialist
-12. If the topic is general news or unclear, route to polly
-
-Respond ONLY with a JSON object in this exact format:
-{{
-    "suggested_agent": "agent_id (must be one of: polly/flynn/pixel/cato/pizzazz/edwin/credo/gaia/happy/omni)",
-    "confidence": "high/medium/low",
-    "reasoning": "brief one-sentence explanation",
-    "needs_routing": true/false,
-    "topic_change": true/false
-}}"""
+    routing_prompt = (
+        f"{_ROUTE_ONLY_PROMPT_PREFIX}\n"
+        "Current conversation context:\n"
+        f"{conversation_context if conversation_context else 'This is the start of the conversation.'}\n\n"
+        f'Current message: "{request.message}"'
+    )
     
     try:
-        from .gemini import gemini_generate
-        contents = [{"role": "user", "parts": [routing_prompt]}]
-        result = gemini_generate(contents=contents, api_key=api_key)
-        response_text = result.get("text", "")
-        
-        # Try to extract JSON from response
-        import json
-        
-        # Find JSON in the response (handle cases where there's extra text)
-        json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', response_text, re.DOTALL)
-        if json_match:
-            routing_data = json.loads(json_match.group())
+        cache_key = _route_cache_key("route-only", request.message, current_agent_id, conversation_context)
+        routing_data = await _cached_routing_decision(cache_key, routing_prompt, api_key)
+        if routing_data is not None:
             suggested_agent_id = routing_data.get("suggested_agent", "polly").lower()
             
             # Validate the suggested agent exists
-            if suggested_agent_id not in AGENTS:
+            if suggested_agent_id not in _AGENT_IDS:
                 suggested_agent_id = "polly"
             
             # Deterministic override: If already talking to a specialist and the user asked generic headlines,
             # stick with the current specialist (sports/tech/politics) instead of routing to polly.
-            def _is_generic_headlines(msg: str) -> bool:
-                ml = (msg or "").lower().strip()
-                headline_words = ["headline", "headlines", "top news", "top stories", "news today", "today's news"]
-                has_headline = any(h in ml for h in headline_words)
-                domain_words = [
-                    "sport", "game", "team", "player", "score", "football", "basketball", "soccer", "nba", "nfl", "baseball",
-                    "tech", "technology", "ai", "software", "app", "digital", "computer", "code", "programming", "gadget", "device",
-                    "politic", "election", "government", "policy", "vote", "civic", "senate", "congress", "president", "democrat", "republican"
-                ]
-                has_domain = any(w in ml for w in domain_words)
-                return has_headline and not has_domain
-            if current_agent_id in ["flynn", "pixel", "cato"] and _is_generic_headlines(request.message):
+            if current_agent_id in _HEADLINE_SPECIALISTS and _is_generic_headlines(request.message.lower()):
                 suggested_agent_id = current_agent_id
             
             # Check if we're already talking to this agent - if so, no routing needed
             if current_agent_id == suggested_agent_id:
                 # Same agent, just continue the conversation
-                return {
-                    "needs_routing": False,
-                    "routing_message": None,
-                    "target_agent": suggested_agent_id
-                }
+                return _no_route(suggested_agent_id)
             
             # Check if routing is actually needed
             needs_routing_flag = routing_data.get("needs_routing", True)
@@ -1165,30 +1743,16 @@ Respond ONLY with a JSON object in this exact format:
             
             # If no routing needed or staying with polly, return
             if not needs_routing_flag or suggested_agent_id == "polly":
-                return {
-                    "needs_routing": False,
-                    "routing_message": None,
-                    "target_agent": suggested_agent_id
-                }
+                return _no_route(suggested_agent_id)
             
             # Different agent detected - prepare routing (but don't always announce)
             suggested_agent = AGENTS[suggested_agent_id]
-            agent_names = {
-                "flynn": "Flynn the Falcon",
-                "pixel": "Pixel the Pigeon",
-                "cato": "Cato the Crane"
-            }
             
             # Only show routing message if there's a clear topic change
             # For subtle shifts, route silently
             routing_message = None
             if topic_change and suggested_agent_id != "polly":
-                routing_messages = {
-                    "flynn": f"This sounds like something {agent_names['flynn']} can help you with! 🦅 He's our sports specialist—let me get him for you.",
-                    "pixel": f"This is right up {agent_names['pixel']}'s alley! 🐦 They're our tech expert—connecting you now.",
-                    "cato": f"{agent_names['cato']} would be perfect for this! 🦩 They specialize in politics and civics—routing you there now."
-                }
-                routing_message = routing_messages.get(suggested_agent_id, f"Let me connect you with {suggested_agent.name}!")
+                routing_message = _ROUTING_MESSAGES.get(suggested_agent_id) or f"Let me connect you with {suggested_agent.name}!"
             
             return {
                 "needs_routing": True,
@@ -1198,93 +1762,86 @@ Respond ONLY with a JSON object in this exact format:
             }
         else:
             # Fallback: simple keyword-based routing if JSON parsing fails
-            message_lower = request.message.lower()
-            suggested_agent_id = "polly"
-            
-            # Stick with current specialist on generic "headlines"
-            generic_headlines = any(w in message_lower for w in ["headline", "headlines", "top news", "top stories", "news today", "today's news"])
-            domain_present = any(word in message_lower for word in [
-                "sport", "game", "team", "player", "score", "football", "basketball", "soccer", "nba", "nfl", "baseball",
-                "tech", "technology", "ai", "software", "app", "digital", "computer", "code", "programming", "gadget", "device",
-                "politic", "election", "government", "policy", "vote", "civic", "senate", "congress", "president", "democrat", "republican"
-            ])
-            if current_agent_id in ["flynn", "pixel", "cato"] and generic_headlines and not domain_present:
-                suggested_agent_id = current_agent_id
-            elif any(word in message_lower for word in ["sport", "game", "team", "player", "score", "football", "basketball", "soccer", "nba", "nfl", "baseball"]):
-                suggested_agent_id = "flynn"
-            elif any(word in message_lower for word in ["tech", "technology", "ai", "software", "app", "digital", "computer", "code", "programming", "gadget", "device"]):
-                suggested_agent_id = "pixel"
-            elif any(word in message_lower for word in ["politic", "election", "government", "policy", "vote", "civic", "senate", "congress", "president", "democrat", "republican"]):
-                suggested_agent_id = "cato"
-            
-            # Check if we're already talking to this agent
-            if current_agent_id == suggested_agent_id:
-                return {
-                    "needs_routing": False,
-                    "routing_message": None,
-                    "target_agent": suggested_agent_id
-                }
-            
-            if suggested_agent_id == "polly":
-                return {
-                    "needs_routing": False,
-                    "routing_message": None,
-                    "target_agent": "polly"
-                }
-            
-            # Different agent - silent routing
-            return {
-                "needs_routing": True,
-                "routing_message": None,  # Silent routing for better UX
-                "target_agent": suggested_agent_id,
-                "target_agent_name": AGENTS[suggested_agent_id].name
-            }
+            return _keyword_fallback_route(request.message, current_agent_id)
             
     except Exception as e:
         # Fallback on error - use keyword matching
         print(f"Error in intelligent routing, falling back to keywords: {str(e)}")
-        message_lower = request.message.lower()
-        suggested_agent_id = "polly"
-        
-        # Stick with current specialist on generic "headlines"
-        generic_headlines = any(w in message_lower for w in ["headline", "headlines", "top news", "top stories", "news today", "today's news"])
-        domain_present = any(word in message_lower for word in [
-            "sport", "game", "team", "player", "score", "football", "basketball", "soccer", "nba", "nfl", "baseball",
-            "tech", "technology", "ai", "software", "app", "digital", "computer", "code", "programming", "gadget", "device",
-            "politic", "election", "government", "policy", "vote", "civic", "senate", "congress", "president", "democrat", "republican"
-        ])
-        if current_agent_id in ["flynn", "pixel", "cato"] and generic_headlines and not domain_present:
-            suggested_agent_id = current_agent_id
-        elif any(word in message_lower for word in ["sport", "game", "team", "player", "score", "football", "basketball", "soccer", "nba", "nfl", "baseball"]):
-            suggested_agent_id = "flynn"
-        elif any(word in message_lower for word in ["tech", "technology", "ai", "software", "app", "digital", "computer", "code", "programming", "gadget", "device"]):
-            suggested_agent_id = "pixel"
-        elif any(word in message_lower for word in ["politic", "election", "government", "policy", "vote", "civic", "senate", "congress", "president", "democrat", "republican"]):
-            suggested_agent_id = "cato"
-        
-        if current_agent_id == suggested_agent_id:
-            return {
-                "needs_routing": False,
-                "routing_message": None,
-                "target_agent": suggested_agent_id
-            }
-        
-        return {
-            "needs_routing": suggested_agent_id != "polly" and suggested_agent_id != current_agent_id,
-            "routing_message": None,  # Silent routing
-            "target_agent": suggested_agent_id,
-            "target_agent_name": AGENTS[suggested_agent_id].name if suggested_agent_id in AGENTS else "Polly the Parrot"
-        }
+        return _keyword_fallback_route(request.message, current_agent_id)
+
+
+def _discard_task(task: "asyncio.Future[Any]") -> None:
+    """Cancel a task whose result is no longer needed, swallowing its outcome.
+
+    Work already handed to a thread keeps running to completion; only the
+    await is abandoned.
+    """
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def _respond_with_news_context(
+    request: ChatRequest,
+    agent_id: str,
+    api_key: str,
+    news_task: Optional["asyncio.Future[Optional[str]]"] = None,
+) -> Tuple[Dict[str, Any], str]:
+    """Build Gemini contents for `agent_id` (history, message, news) and reply.
+
+    Args:
+        request: The chat request
+        agent_id: Agent that should reply
+        api_key: Gemini API key
+        news_task: Already-running news lookup for this agent, if any
+
+    Returns:
+        Tuple of (agent.respond result, news context that was appended)
+    """
+    agent = AGENTS[agent_id]
+    
+    # Build conversation history - include previous messages and current message
+    if request.conversation_history:
+        logger.debug("[chat_and_route] Received conversation history with %d items", len(request.conversation_history))
+    else:
+        logger.debug("[chat_and_route] No conversation history provided")
+    contents = _build_history_contents(request.conversation_history)
+    
+    # Check if we should fetch current news for this message
+    if news_task is not None:
+        news_context = await news_task
+    else:
+        logger.debug("[chat_and_route] Checking news context for message: '%s', agent: %s", request.message, agent.name)
+        news_context = await asyncio.to_thread(get_news_context, request.message, agent.name)
+    
+    # Add current message (with news context if available)
+    user_message = request.message
+    if news_context:
+        user_message = user_message + news_context
+        logger.debug("[chat_and_route] Added news context to message (length: %d chars)", len(news_context))
+    else:
+        logger.debug("[chat_and_route] No news context added")
+    
+    contents.append({"role": "user", "parts": [user_message]})
+    logger.debug("[chat_and_route] Total conversation context: %d messages", len(contents))
+    
+    # Determine if this is the first message (no conversation history)
+    is_first_message = not request.conversation_history
+    
+    result = await asyncio.to_thread(
+        agent.respond,
+        contents=contents, 
+        api_key=api_key, 
+        is_first_message=is_first_message,
+        user_name=request.user_name,
+        parrot_name=request.parrot_name
+    )
+    return result, news_context
 
 
 @app.post("/agents/chat-and-route", response_model=ChatResponse)
 async def chat_with_routing(request: ChatRequest):
     # Content moderation: check if user message is appropriate
-    from .content_moderation import moderate_content
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    is_appropriate, moderation_reason = moderate_content(request.message, api_key=request.api_key)
+    is_appropriate, moderation_reason = await asyncio.to_thread(moderate_content, request.message, api_key=request.api_key)
     if not is_appropriate:
         logger.warning(f"[content_moderation] Blocked inappropriate message in chat-and-route: {request.message[:100]}")
         raise HTTPException(
@@ -1292,13 +1849,7 @@ async def chat_with_routing(request: ChatRequest):
             detail=moderation_reason or "Your message contains inappropriate content. Please rephrase your question in a respectful way."
         )
     """Chat with automatic routing - returns routing message immediately, then specialist response."""
-    api_key = request.api_key or get_gemini_api_key()
-    
-    if not api_key:
-        raise HTTPException(
-            status_code=400,
-            detail="GEMINI_API_KEY not set. Provide it in the request or set it in .env file."
-        )
+    api_key = require_gemini_key(request.api_key)
     
     # Detect current agent from conversation history
     current_agent_id = detect_current_agent_from_history(request.conversation_history)
@@ -1306,9 +1857,33 @@ async def chat_with_routing(request: ChatRequest):
     # If agent is polly or message suggests routing, check if we should route
     original_agent = request.agent.lower()
     
+    # Speculatively start replying as the agent we're most likely to stay with,
+    # so the reply overlaps _route_only's Gemini call instead of following it.
+    # When keywords already point at a different specialist, the reply can't
+    # start yet, but that specialist's news lookup can overlap routing instead.
+    speculative_agent_id = current_agent_id or request.agent
+    speculation: Optional["asyncio.Task[Tuple[Dict[str, Any], str]]"] = None
+    predicted_agent_id = _classify(request.message.lower())
+    news_prefetch: Optional["asyncio.Future[Optional[str]]"] = None
+    if predicted_agent_id in ("polly", speculative_agent_id):
+        speculation = asyncio.ensure_future(
+            _respond_with_news_context(request, speculative_agent_id, api_key)
+        )
+    else:
+        news_prefetch = asyncio.ensure_future(
+            asyncio.to_thread(get_news_context, request.message, AGENTS[predicted_agent_id].name)
+        )
+    
     # Always check routing - any message can potentially route to a different specialist
     # This allows any agent to detect when the user wants to switch topics
-    route_info = await route_only(request)
+    try:
+        route_info = await _route_only(request)
+    except BaseException:
+        if speculation is not None:
+            _discard_task(speculation)
+        if news_prefetch is not None:
+            _discard_task(news_prefetch)
+        raise
     
     routing_message = None
     routed_from = None
@@ -1329,11 +1904,24 @@ async def chat_with_routing(request: ChatRequest):
         # No routing needed
         routing_message = None
     
+    if speculation is not None and target_agent_id != speculative_agent_id:
+        # Routed elsewhere; the speculative reply is for the wrong agent
+        logger.debug("[chat_and_route] Discarding speculative reply from %s, routed to %s", speculative_agent_id, target_agent_id)
+        _discard_task(speculation)
+        speculation = None
+    if news_prefetch is not None and target_agent_id != predicted_agent_id:
+        # News was summarized for a different specialist
+        _discard_task(news_prefetch)
+        news_prefetch = None
+    
     # Chat with the determined agent
-    if target_agent_id not in AGENTS:
+    if target_agent_id not in _AGENT_IDS:
+        for pending in (speculation, news_prefetch):
+            if pending is not None:
+                _discard_task(pending)
         raise HTTPException(
             status_code=404,
-            detail=f"Agent '{target_agent_id}' not found. Available agents: {', '.join(AGENTS.keys())}"
+            detail=f"Agent '{target_agent_id}' not found. Available agents: {_AGENT_LIST_STR}"
         )
     
     agent = AGENTS[target_agent_id]
@@ -1364,60 +1952,6 @@ async def chat_with_routing(request: ChatRequest):
         return {"league": league, "sport": sport, "mode": mode}
     
     try:
-        # Build conversation history - include previous messages and current message
-        contents = []
-        
-        # Add conversation history if provided
-        if request.conversation_history:
-            print(f"[chat_and_route] Received conversation history with {len(request.conversation_history)} items")
-            # Validate and add history messages
-            for item in request.conversation_history:
-                if isinstance(item, dict) and "role" in item and "parts" in item:
-                    # Ensure role is 'user' or 'model'
-                    role = item["role"]
-                    if role not in ["user", "model"]:
-                        # Try to map agent/user to model/user
-                        if role == "agent":
-                            role = "model"
-                        else:
-                            role = "user"
-                    
-                    # Ensure parts is a list
-                    parts = item["parts"]
-                    if not isinstance(parts, list):
-                        parts = [str(parts)]
-                    
-                    # Strip agent metadata from parts before sending to Gemini
-                    # Format: "text [Agent: Name]" -> "text"
-                    cleaned_parts = []
-                    for part in parts:
-                        part_str = str(part)
-                        # Remove [Agent: Name] metadata pattern
-                        cleaned = re.sub(r'\s*\[Agent:\s*[^\]]+\]\s*$', '', part_str, flags=re.IGNORECASE)
-                        cleaned_parts.append(cleaned.strip())
-                    
-                    contents.append({
-                        "role": role,
-                        "parts": cleaned_parts
-                    })
-        else:
-            print(f"[chat_and_route] No conversation history provided")
-        
-        # Check if we should fetch current news for this message
-        print(f"[chat_and_route] Checking news context for message: '{request.message}', agent: {agent.name}")
-        news_context = get_news_context(request.message, agent.name)
-        
-        # Add current message (with news context if available)
-        user_message = request.message
-        if news_context:
-            user_message = user_message + news_context
-            print(f"[chat_and_route] Added news context to message (length: {len(news_context)} chars)")
-        else:
-            print(f"[chat_and_route] No news context added")
-        
-        contents.append({"role": "user", "parts": [user_message]})
-        print(f"[chat_and_route] Total conversation context: {len(contents)} messages")
-        
         # Optional: fetch live/recent sports scores for sports queries (NFL/NBA etc.)
         scoreboard: Optional[SportsScoreboardResponse] = None
         # Only do this for the sports agent to avoid noise
@@ -1428,22 +1962,25 @@ async def chat_with_routing(request: ChatRequest):
                     today = datetime.now(timezone.utc).date().isoformat()
                     mode = scores_req.get("mode", "today")
                     if mode == "latest":
-                        print(
-                            f"[chat_and_route] Fetching latest sports scores from TheSportsDB "
-                            f"(eventspastleague) league={scores_req['league']} sport={scores_req['sport']}"
+                        logger.debug(
+                            "[chat_and_route] Fetching latest sports scores from TheSportsDB "
+                            "(eventspastleague) league=%s sport=%s",
+                            scores_req["league"], scores_req["sport"],
                         )
-                        games = fetch_past_league_events(scores_req["league"])
+                        games = await asyncio.to_thread(fetch_past_league_events, scores_req["league"])
                     else:
-                        print(
-                            f"[chat_and_route] Fetching sports scoreboard from TheSportsDB "
-                            f"(eventsday) league={scores_req['league']} sport={scores_req['sport']} date={today}"
+                        logger.debug(
+                            "[chat_and_route] Fetching sports scoreboard from TheSportsDB "
+                            "(eventsday) league=%s sport=%s date=%s",
+                            scores_req["league"], scores_req["sport"], today,
                         )
-                        games = fetch_events_day(
+                        games = await asyncio.to_thread(
+                            fetch_events_day,
                             date_iso=today,
                             sport=scores_req["sport"],
                             league=scores_req["league"],
                         )
-                    print(f"[chat_and_route] Sports scoreboard returned {len(games)} games (mode={mode})")
+                    logger.debug("[chat_and_route] Sports scoreboard returned %d games (mode=%s)", len(games), mode)
                     if games:
                         # If using latest mode, take the date from the events themselves
                         sb_date = today
@@ -1456,21 +1993,16 @@ async def chat_with_routing(request: ChatRequest):
                             games=[SportsGame(**g) for g in games],
                         )
                 except Exception as exc:
-                    print(f"[chat_and_route] Error fetching sports scoreboard: {exc}")
+                    logger.warning("[chat_and_route] Error fetching sports scoreboard: %s", exc)
         
-        # Determine if this is the first message (no conversation history)
-        is_first_message = not request.conversation_history or len(request.conversation_history) == 0
-        
-        result = agent.respond(
-            contents=contents, 
-            api_key=api_key, 
-            is_first_message=is_first_message,
-            user_name=request.user_name,
-            parrot_name=request.parrot_name
-        )
+        # Use the speculative reply if it was started for the agent we routed to
+        if speculation is not None:
+            result, news_context = await speculation
+        else:
+            result, news_context = await _respond_with_news_context(request, target_agent_id, api_key, news_prefetch)
         
         has_ref = result.get("has_article_reference", False)
-        print(f"[chat_and_route] Result has_article_reference={has_ref}, result keys: {list(result.keys())}")
+        logger.debug("[chat_and_route] Result has_article_reference=%s, result keys: %s", has_ref, list(result))
         
         # Use custom parrot name if provided and agent is Polly
         agent_display_name = agent.name
@@ -1486,7 +2018,6 @@ async def chat_with_routing(request: ChatRequest):
         structured_articles = None
         if _is_headlines_request(request.message):
             try:
-                from .news_helper import fetch_top_headlines_structured
                 # Tailor headlines by agent
                 kwargs: Dict[str, Any] = {"country": "us", "page_size": 6, "min_items": 5, "max_pages": 3}
                 if target_agent_id == "flynn":
@@ -1495,7 +2026,7 @@ async def chat_with_routing(request: ChatRequest):
                     kwargs["category"] = "technology"
                 elif target_agent_id == "cato":
                     kwargs["q"] = "politics OR election OR policy OR government"
-                items = fetch_top_headlines_structured(**kwargs)
+                items = await asyncio.to_thread(fetch_top_headlines_structured, **kwargs)
                 if items:
                     structured_articles = []
                     # ALWAYS classify tags using the classifier agent – this is
@@ -1509,13 +2040,13 @@ async def chat_with_routing(request: ChatRequest):
 Source: {it.get('source_name') or 'Unknown'}
 Title: {it.get('headline') or ''}
 URL: {it.get('url') or ''}"""
-                            cls = CLASSIFIER.respond(
+                            cls = await asyncio.to_thread(
+                                CLASSIFIER.respond,
                                 contents=[{"role": "user", "parts": [classify_text]}],
                                 api_key=api_key
                             )
                             resp = cls.get("text") or ""
-                            m = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', resp, re.DOTALL)
-                            data = json.loads(m.group()) if m else {}
+                            data = extract_json_object(resp) or {}
                             # Derive simple tags from fields
                             clean_headline = (data.get("clean_headline") or "").strip()
                             t_domain = (data.get("topic_domain") or "").strip().lower()
@@ -1567,17 +2098,17 @@ URL: {it.get('url') or ''}"""
         # Only check for visualizations for agents that support them (Omni, Gaia, Edwin, etc.)
         visualization_agents = ["omni", "gaia", "edwin", "pixel", "cato"]
         if target_agent_id.lower() in visualization_agents:
-            viz_intent = detect_chart_or_timeline_intent(request.message, agent.name, api_key)
+            viz_intent = await asyncio.to_thread(detect_chart_or_timeline_intent, request.message, agent.name, api_key)
             if viz_intent.get("needs_visualization"):
                 viz_type = viz_intent.get("visualization_type")
                 topic = viz_intent.get("topic", "")
                 
                 if viz_type == "chart":
                     chart_type = viz_intent.get("chart_type", "line")
-                    chart_data_dict = generate_chart_data(topic, chart_type, news_context, api_key)
+                    chart_data_dict = await asyncio.to_thread(generate_chart_data, topic, chart_type, news_context, api_key)
                     if chart_data_dict:
                         chart_data = ChartData(**chart_data_dict)
-                        print(f"[chat_and_route] Generated {chart_type} chart: {chart_data.title}")
+                        logger.debug("[chat_and_route] Generated %s chart: %s", chart_type, chart_data.title)
                     else:
                         visualization_note = (
                             "Note: A chart might seem helpful here, but we don't have clear, reliable "
@@ -1587,10 +2118,10 @@ URL: {it.get('url') or ''}"""
                         )
                 
                 elif viz_type == "timeline":
-                    timeline_data_dict = generate_timeline_data(topic, news_context, api_key)
+                    timeline_data_dict = await asyncio.to_thread(generate_timeline_data, topic, news_context, api_key)
                     if timeline_data_dict:
                         timeline_data = TimelineData(**timeline_data_dict)
-                        print(f"[chat_and_route] Generated timeline: {timeline_data.title}")
+                        logger.debug("[chat_and_route] Generated timeline: %s", timeline_data.title)
                     else:
                         visualization_note = (
                             "Note: For this question, a timeline of specific dated events isn't a great fit. "
@@ -1609,9 +2140,9 @@ URL: {it.get('url') or ''}"""
             else:
                 final_text = visualization_note
 
-        return ChatResponse(
-            agent=agent_display_name,
-            response=final_text,
+        return ORJSONResponse(_chat_payload(
+            agent_display_name,
+            final_text,
             routing_message=routing_message,
             routed_from=routed_from,
             has_article_reference=has_ref,
@@ -1619,560 +2150,25 @@ URL: {it.get('url') or ''}"""
             chart=chart_data,
             timeline=timeline_data,
             scoreboard=scoreboard,
-        )
+        ))
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
+    finally:
+        # A failure before the reply was awaited would otherwise leave these
+        # running with their outcome never retrieved; discarding an already
+        # awaited one is a no-op
+        for pending in (speculation, news_prefetch):
+            if pending is not None:
+                _discard_task(pending)
+
+
+# Simple HTML test page for agents; read, compressed and hashed once at import
+_TEST_PAGE_PATH = os.path.join(os.path.dirname(__file__), "static", "test_page.html")
+with open(_TEST_PAGE_PATH, "rb") as _f:
+    _TEST_PAGE = _encode_body(_f.read(), gzip_level=9)
 
 
 @app.get("/", response_class=HTMLResponse)
-async def test_page():
+async def test_page(request: Request):
     """Simple HTML test page for agents."""
-    return """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>News Nest Agents - Test Interface</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        
-        .container {
-            max-width: 900px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 20px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }
-        
-        .header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }
-        
-        .header h1 {
-            font-size: 2.5em;
-            margin-bottom: 10px;
-        }
-        
-        .header p {
-            opacity: 0.9;
-            font-size: 1.1em;
-        }
-        
-        .content {
-            padding: 30px;
-        }
-        
-        .agent-selector {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 15px;
-            margin-bottom: 30px;
-        }
-        
-        .agent-card {
-            border: 3px solid #e0e0e0;
-            border-radius: 12px;
-            padding: 20px;
-            cursor: pointer;
-            transition: all 0.3s;
-            text-align: center;
-            background: #f8f9fa;
-        }
-        
-        .agent-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-        }
-        
-        .agent-card.active {
-            border-color: #667eea;
-            background: #e8edff;
-        }
-        
-        .agent-card h3 {
-            margin-bottom: 8px;
-            color: #333;
-        }
-        
-        .agent-card p {
-            font-size: 0.9em;
-            color: #666;
-        }
-        
-        .chat-container {
-            border: 2px solid #e0e0e0;
-            border-radius: 12px;
-            height: 400px;
-            overflow-y: auto;
-            padding: 20px;
-            margin-bottom: 20px;
-            background: #f8f9fa;
-        }
-        
-        .message {
-            margin-bottom: 15px;
-            padding: 12px 16px;
-            border-radius: 12px;
-            max-width: 80%;
-            animation: fadeIn 0.3s;
-        }
-        
-        .message p {
-            margin: 0;
-            margin-bottom: 12px;
-            line-height: 1.6;
-        }
-        
-        .message p:last-child {
-            margin-bottom: 0;
-        }
-        
-        @keyframes fadeIn {
-            from { opacity: 0; transform: translateY(10px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-        
-        .message.user {
-            background: #667eea;
-            color: white;
-            margin-left: auto;
-            text-align: right;
-        }
-        
-        .message.agent {
-            background: white;
-            border: 2px solid #e0e0e0;
-            color: #333;
-        }
-        
-        .message-header {
-            font-weight: bold;
-            font-size: 0.9em;
-            margin-bottom: 5px;
-            opacity: 0.8;
-        }
-        
-        .input-container {
-            display: flex;
-            gap: 10px;
-        }
-        
-        input[type="text"] {
-            flex: 1;
-            padding: 15px;
-            border: 2px solid #e0e0e0;
-            border-radius: 12px;
-            font-size: 1em;
-            outline: none;
-            transition: border-color 0.3s;
-        }
-        
-        input[type="text"]:focus {
-            border-color: #667eea;
-        }
-        
-        button {
-            padding: 15px 30px;
-            background: #667eea;
-            color: white;
-            border: none;
-            border-radius: 12px;
-            font-size: 1em;
-            cursor: pointer;
-            transition: background 0.3s;
-            font-weight: bold;
-        }
-        
-        button:hover {
-            background: #5568d3;
-        }
-        
-        button:disabled {
-            background: #ccc;
-            cursor: not-allowed;
-        }
-        
-        .api-key-section {
-            margin-bottom: 20px;
-            padding: 15px;
-            background: #fff3cd;
-            border-radius: 12px;
-            border-left: 4px solid #ffc107;
-        }
-        
-        .api-key-section input {
-            width: 100%;
-            padding: 10px;
-            margin-top: 8px;
-            border: 1px solid #ddd;
-            border-radius: 8px;
-            font-family: monospace;
-        }
-        
-        .loading {
-            text-align: center;
-            color: #666;
-            padding: 20px;
-        }
-        
-        .error {
-            background: #f8d7da;
-            color: #721c24;
-            padding: 12px 16px;
-            border-radius: 12px;
-            margin-bottom: 15px;
-        }
-        
-        .routing-badge {
-            display: inline-block;
-            background: #e3f2fd;
-            color: #1976d2;
-            padding: 4px 8px;
-            border-radius: 6px;
-            font-size: 0.85em;
-            margin-left: 10px;
-            font-weight: normal;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🦜 News Nest Agents</h1>
-            <p>Test your AI agents in the browser</p>
-        </div>
-        
-        <div class="content">
-            <div class="api-key-section">
-                <strong>Gemini API Key (optional):</strong>
-                <p style="font-size: 0.9em; margin-top: 5px; color: #666;">
-                    If not set in .env file, enter it here. Otherwise leave blank to use environment variable.
-                </p>
-                <input type="password" id="apiKey" placeholder="GEMINI_API_KEY (or leave blank if set in .env)">
-            </div>
-            
-            <div class="agent-selector">
-                <div class="agent-card active" data-agent="polly" onclick="selectAgent('polly')">
-                    <h3>🦜 Polly</h3>
-                    <p>Main Host / Router<br><small style="opacity:0.7;">Auto-routes topics</small></p>
-                </div>
-                <div class="agent-card" data-agent="flynn" onclick="selectAgent('flynn')">
-                    <h3>🦅 Flynn</h3>
-                    <p>Sports Commentator</p>
-                </div>
-                <div class="agent-card" data-agent="pixel" onclick="selectAgent('pixel')">
-                    <h3>🐦 Pixel</h3>
-                    <p>Tech Explainer</p>
-                </div>
-                <div class="agent-card" data-agent="cato" onclick="selectAgent('cato')">
-                    <h3>🦩 Cato</h3>
-                    <p>Civic Commentator</p>
-                </div>
-            </div>
-            
-            <div class="routing-info" id="routingInfo" style="display:none; padding: 10px; margin-bottom: 15px; background: #e3f2fd; border-left: 4px solid #2196f3; border-radius: 8px; font-size: 0.9em;">
-                <strong>🔄 Auto-routed to:</strong> <span id="routingText"></span>
-            </div>
-            
-            <div class="chat-container" id="chatContainer">
-                <div class="message agent">
-                    <div class="message-header">🦜 Polly the Parrot</div>
-                    <div>Welcome to News Nest! I'm Polly, your friendly news anchor. Ask me anything about today's news — or just say <em>\"headlines\"</em> and I'll share today's top 6 stories. You can also click on a specific agent card to chat directly with them.</div>
-                </div>
-            </div>
-            
-            <div class="input-container">
-                <input type="text" id="messageInput" placeholder="Type your message here..." onkeypress="handleKeyPress(event)">
-                <button onclick="sendMessage()" id="sendButton">Send</button>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        let currentAgent = 'polly';
-        
-        function selectAgent(agentId) {
-            currentAgent = agentId;
-            document.querySelectorAll('.agent-card').forEach(card => {
-                card.classList.remove('active');
-            });
-            document.querySelector(`[data-agent="${agentId}"]`).classList.add('active');
-        }
-        
-        function handleKeyPress(event) {
-            if (event.key === 'Enter') {
-                sendMessage();
-            }
-        }
-        
-        async function sendMessage() {
-            const input = document.getElementById('messageInput');
-            const message = input.value.trim();
-            
-            if (!message) return;
-            
-            const chatContainer = document.getElementById('chatContainer');
-            const sendButton = document.getElementById('sendButton');
-            const apiKey = document.getElementById('apiKey').value.trim();
-            const routingInfo = document.getElementById('routingInfo');
-            const routingText = document.getElementById('routingText');
-            
-            // Add user message
-            const userMessage = document.createElement('div');
-            userMessage.className = 'message user';
-            userMessage.innerHTML = `<div>${escapeHtml(message)}</div>`;
-            chatContainer.appendChild(userMessage);
-            
-            input.value = '';
-            sendButton.disabled = true;
-            sendButton.textContent = 'Sending...';
-            
-            // Hide routing info
-            routingInfo.style.display = 'none';
-            
-            // Show loading
-            const loading = document.createElement('div');
-            loading.className = 'loading';
-            loading.id = 'loading';
-            loading.textContent = currentAgent === 'polly' ? 'Analyzing and routing...' : 'Thinking...';
-            chatContainer.appendChild(loading);
-            chatContainer.scrollTop = chatContainer.scrollHeight;
-            
-            try {
-                const agentNames = {
-                    'polly': '🦜 Polly the Parrot',
-                    'flynn': '🦅 Flynn the Falcon',
-                    'pixel': '🐦 Pixel the Pigeon',
-                    'cato': '🦩 Cato the Crane'
-                };
-                
-                // For Polly, get routing message first (quick), then specialist response
-                if (currentAgent === 'polly') {
-                    // Step 1: Get routing message immediately
-                    const routeResponse = await fetch('/agents/route-only', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            agent: currentAgent,
-                            message: message,
-                            api_key: apiKey || null
-                        })
-                    });
-                    
-                    const routeData = await routeResponse.json();
-                    
-                    if (!routeResponse.ok) {
-                        throw new Error(routeData.detail || 'Failed to get routing info');
-                    }
-                    
-                    // Show Polly's routing message immediately if routing is needed
-                    if (routeData.needs_routing && routeData.routing_message) {
-                        // Remove loading for now
-                        document.getElementById('loading').remove();
-                        
-                        // Use the same splitting function for routing message
-                        addAgentResponse(chatContainer, routeData.routing_message, `${agentNames['polly']} 🔄 Routing`, '');
-                        
-                        // Show routing info banner
-                        routingText.textContent = `${agentNames[routeData.target_agent] || routeData.target_agent_name}`;
-                        routingInfo.style.display = 'block';
-                        
-                        // Show loading for specialist response
-                        const loading2 = document.createElement('div');
-                        loading2.className = 'loading';
-                        loading2.id = 'loading2';
-                        loading2.textContent = `Getting response from ${agentNames[routeData.target_agent] || routeData.target_agent_name}...`;
-                        chatContainer.appendChild(loading2);
-                        chatContainer.scrollTop = chatContainer.scrollHeight;
-                    }
-                    
-                    // Step 2: Get the actual agent response
-                    const targetAgent = routeData.target_agent || currentAgent;
-                    const chatEndpoint = '/agents/chat';
-                    const chatResponse = await fetch(chatEndpoint, {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            agent: targetAgent,
-                            message: message,
-                            api_key: apiKey || null
-                        })
-                    });
-                    
-                    const chatData = await chatResponse.json();
-                    
-                    // Remove any loading indicators
-                    document.getElementById('loading')?.remove();
-                    document.getElementById('loading2')?.remove();
-                    
-                    if (!chatResponse.ok) {
-                        throw new Error(chatData.detail || 'Failed to get response');
-                    }
-                    
-                    // Show the specialist's response (split into multiple messages)
-                    const actualAgent = targetAgent;
-                    const headerText = agentNames[actualAgent] || chatData.agent;
-                    const routingBadge = (routeData.needs_routing) 
-                        ? '<span class="routing-badge">🔄 Auto-routed</span>' 
-                        : '';
-                    
-                    // Split response into paragraphs and create separate messages
-                    addAgentResponse(chatContainer, chatData.response, headerText, routingBadge);
-                    
-                } else {
-                    // For other agents, just chat normally
-                    const endpoint = '/agents/chat';
-                    const response = await fetch(endpoint, {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            agent: currentAgent,
-                            message: message,
-                            api_key: apiKey || null
-                        })
-                    });
-                    
-                    const data = await response.json();
-                    
-                    // Remove loading
-                    document.getElementById('loading').remove();
-                    
-                    if (!response.ok) {
-                        throw new Error(data.detail || 'Failed to get response');
-                    }
-                    
-                    // Add agent response (split into multiple messages)
-                    const headerText = agentNames[currentAgent] || data.agent;
-                    addAgentResponse(chatContainer, data.response, headerText, '');
-                }
-                
-            } catch (error) {
-                document.getElementById('loading')?.remove();
-                const errorMessage = document.createElement('div');
-                errorMessage.className = 'error';
-                errorMessage.textContent = `Error: ${error.message}`;
-                chatContainer.appendChild(errorMessage);
-            } finally {
-                sendButton.disabled = false;
-                sendButton.textContent = 'Send';
-                chatContainer.scrollTop = chatContainer.scrollHeight;
-            }
-        }
-        
-        function escapeHtml(text) {
-            const div = document.createElement('div');
-            div.textContent = text;
-            return div.innerHTML;
-        }
-        
-        function addAgentResponse(container, responseText, headerText, badge) {
-            // Split response by double newlines or periods followed by space/newline
-            // This creates natural paragraph breaks
-            const paragraphs = responseText
-                .split(/\n\n+/)
-                .map(p => p.trim())
-                .filter(p => p.length > 0);
-            
-            // If no double newlines, try splitting by single newlines
-            if (paragraphs.length === 1) {
-                const singleLineBreaks = responseText
-                    .split(/\n/)
-                    .map(p => p.trim())
-                    .filter(p => p.length > 0);
-                
-                // If we have multiple single-line paragraphs, use those
-                if (singleLineBreaks.length > 1) {
-                    paragraphs.length = 0;
-                    paragraphs.push(...singleLineBreaks);
-                }
-            }
-            
-            // If still only one paragraph, try splitting by long sentences (period + space)
-            // but only if the text is quite long
-            if (paragraphs.length === 1 && responseText.length > 200) {
-                const sentences = responseText.match(/[^.!?]+[.!?]+/g);
-                if (sentences && sentences.length > 2) {
-                    // Group sentences into chunks of 2-3 sentences
-                    const chunks = [];
-                    for (let i = 0; i < sentences.length; i += 2) {
-                        const chunk = sentences.slice(i, i + 2).join(' ').trim();
-                        if (chunk) chunks.push(chunk);
-                    }
-                    if (chunks.length > 1) {
-                        paragraphs.length = 0;
-                        paragraphs.push(...chunks);
-                    }
-                }
-            }
-            
-            // Create a message for each paragraph (or combine short ones)
-            const messageGroups = [];
-            let currentGroup = [];
-            
-            paragraphs.forEach((para, index) => {
-                currentGroup.push(para);
-                // If paragraph is long enough or we have 2-3 short ones, create a message
-                if (para.length > 150 || currentGroup.length >= 2 || index === paragraphs.length - 1) {
-                    messageGroups.push([...currentGroup]);
-                    currentGroup = [];
-                }
-            });
-            
-            // If we still have ungrouped items, add them
-            if (currentGroup.length > 0) {
-                messageGroups.push(currentGroup);
-            }
-            
-            // Create message elements
-            messageGroups.forEach((group, groupIndex) => {
-                const agentMessage = document.createElement('div');
-                agentMessage.className = 'message agent';
-                
-                // Only show header on first message
-                const headerHtml = groupIndex === 0 
-                    ? `<div class="message-header">${headerText}${badge}</div>`
-                    : '';
-                
-                // Format paragraphs with spacing
-                const contentHtml = group
-                    .map(para => `<p>${escapeHtml(para)}</p>`)
-                    .join('');
-                
-                agentMessage.innerHTML = headerHtml + '<div>' + contentHtml + '</div>';
-                container.appendChild(agentMessage);
-                
-                // Add slight delay between messages for smooth appearance
-                if (groupIndex > 0) {
-                    agentMessage.style.animationDelay = `${groupIndex * 0.1}s`;
-                }
-                
-                container.scrollTop = container.scrollHeight;
-            });
-        }
-    </script>
-</body>
-</html>
-    """
-
+    return _encoded_response(request, _TEST_PAGE, "text/html")
@@ -1,10 +1,13 @@
 """Helper functions for fetching and summarizing news for agents."""
 
+import re
 from typing import Optional, Dict, Any, List
 from urllib.parse import urlparse
-from .newsapi_client import fetch_news, fetch_top_headlines
+import httpx
+from .newsapi_client import fetch_news, fetch_news_async, fetch_top_headlines
 from .config import get_newsapi_key, get_gemini_api_key
 from .gemini import gemini_generate
+from .cache import TTLCache
 
 
 def fetch_relevant_news(query: str, days_back: int = 3, max_articles: int = 5) -> Optional[Dict[str, Any]]:
@@ -58,6 +61,57 @@ def fetch_relevant_news(query: str, days_back: int = 3, max_articles: int = 5) -
         return None
 
 
+async def fetch_relevant_news_async(
+    client: httpx.AsyncClient,
+    query: str,
+    days_back: int = 3,
+    max_articles: int = 5,
+) -> Optional[Dict[str, Any]]:
+    """
+    Async variant of `fetch_relevant_news` using a shared httpx client.
+    
+    Args:
+        client: Connection-pooled client owned by the app lifespan
+        query: Search query (topic, keywords)
+        days_back: How many days back to search (default: 3)
+        max_articles: Maximum number of articles to return (default: 5)
+    
+    Returns:
+        Dictionary with news data or None if fetch fails
+    """
+    api_key = get_newsapi_key()
+    if not api_key:
+        print("[fetch_relevant_news_async] No NewsAPI key found. Set NEWSAPI_KEY in .env file")
+        return None
+    
+    query = query.strip()
+    if not query or len(query) < 2:
+        query = "news"
+    
+    print(f"[fetch_relevant_news_async] Attempting to fetch news for query: '{query}' (last {days_back} days)")
+    
+    try:
+        data = await fetch_news_async(
+            client,
+            api_key,
+            q=query,
+            from_days=days_back,
+            page_size=max_articles,
+            sort_by="publishedAt",
+            language="en"
+        )
+        
+        if data and data.get("status") == "ok":
+            articles = data.get("articles", [])
+            print(f"[fetch_relevant_news_async] Successfully fetched {len(articles)} articles")
+            return data
+        print(f"[fetch_relevant_news_async] NewsAPI returned error: {data}")
+        return None
+    except Exception as e:
+        print(f"[fetch_relevant_news_async] Error fetching news: {e}")
+        return None
+
+
 def fetch_headlines_prompt(
     *,
     country: Optional[str] = "us",
@@ -398,6 +452,31 @@ Don't include article numbers or sources in the summary - just the key informati
         return ""
 
 
+def _substring_re(words) -> "re.Pattern[str]":
+    """One alternation matching any of `words` anywhere, so a message is scanned once."""
+    return re.compile("|".join(re.escape(w) for w in words))
+
+
+# Keywords that suggest user wants current news
+_WANTS_NEWS_RE = _substring_re((
+    "today", "recent", "latest", "news", "happened", "happening",
+    "current", "update", "now", "this week", "headlines", "what's",
+    "what is", "tell me about", "what happened", "any news"
+))
+# Specialist topics that justify a fetch even without a news keyword
+_AGENT_TOPIC_RES = (
+    ("flynn", _substring_re(("sports", "game", "match", "team", "player"))),
+    ("pixel", _substring_re(("tech", "technology", "ai", "software"))),
+    ("cato", _substring_re(("politics", "election", "government", "policy"))),
+)
+# Dropped from the search query
+_QUESTION_WORDS = frozenset(("what", "tell", "give", "show", "about", "the", "a", "an"))
+
+# Summaries from get_news_context keyed by (lowercased message, agent name).
+# Kept short so "latest news" answers stay current.
+_NEWS_CONTEXT_CACHE = TTLCache(maxsize=1024, ttl=300)
+
+
 def get_news_context(message: str, agent_name: str) -> Optional[str]:
     """
     Determine if message needs news and fetch/summarize it.
@@ -411,24 +490,22 @@ def get_news_context(message: str, agent_name: str) -> Optional[str]:
     """
     message_lower = message.lower().strip()
     
-    # Keywords that suggest user wants current news
-    news_keywords = [
-        "today", "recent", "latest", "news", "happened", "happening",
-        "current", "update", "now", "this week", "headlines", "what's",
-        "what is", "tell me about", "what happened", "any news"
-    ]
+    cache_key = (message_lower, agent_name)
+    cached = _NEWS_CONTEXT_CACHE.get(cache_key)
+    if cached is not None:
+        print(f"[get_news_context] Using cached news context for '{message}', Agent: {agent_name}")
+        return cached
     
     # Check if message seems to ask for current news
-    wants_news = any(keyword in message_lower for keyword in news_keywords)
+    wants_news = _WANTS_NEWS_RE.search(message_lower) is not None
     
     # Extract search query from message
     # Remove common question words and news keywords for better search
     search_query = message
-    question_words = ["what", "tell", "give", "show", "about", "the", "a", "an"]
     
     # Clean up the query for search
     words = message.split()
-    cleaned_words = [w for w in words if w.lower() not in question_words and len(w) > 2]
+    cleaned_words = [w for w in words if len(w) > 2 and w.lower() not in _QUESTION_WORDS]
     
     if cleaned_words:
         search_query = " ".join(cleaned_words)
@@ -445,12 +522,12 @@ def get_news_context(message: str, agent_name: str) -> Optional[str]:
     elif wants_news:
         # Any agent should fetch if explicitly asking for news
         should_fetch = True
-    elif any(word in message_lower for word in ["sports", "game", "match", "team", "player"]) and "flynn" in agent_lower:
-        should_fetch = True
-    elif any(word in message_lower for word in ["tech", "technology", "ai", "software"]) and "pixel" in agent_lower:
-        should_fetch = True
-    elif any(word in message_lower for word in ["politics", "election", "government", "policy"]) and "cato" in agent_lower:
-        should_fetch = True
+    else:
+        # Check the cheap agent-name test first; only that specialist's topics matter
+        for agent_key, topic_re in _AGENT_TOPIC_RES:
+            if agent_key in agent_lower:
+                should_fetch = topic_re.search(message_lower) is not None
+                break
     
     print(f"[get_news_context] Message: '{message}', Agent: {agent_name}, Should fetch: {should_fetch}, Search query: '{search_query}'")
     
@@ -469,7 +546,9 @@ def get_news_context(message: str, agent_name: str) -> Optional[str]:
                 
                 if summary:
                     print(f"[get_news_context] Successfully created news summary ({len(summary)} chars)")
-                    return f"\n\n[CURRENT NEWS CONTEXT]\n{summary}"
+                    news_context = f"\n\n[CURRENT NEWS CONTEXT]\n{summary}"
+                    _NEWS_CONTEXT_CACHE.set(cache_key, news_context)
+                    return news_context
                 else:
                     print(f"[get_news_context] Failed to create summary")
             else:
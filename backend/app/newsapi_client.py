@@ -1,14 +1,23 @@
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
+import asyncio
 import time
+import httpx
 import requests
 
+from .http_session import pooled_session
+
+EVERYTHING_ENDPOINT = "https://newsapi.org/v2/everything"
+
+# Shared by the /everything and /top-headlines fetchers
+_SESSION = pooled_session()
+
 
 def _iso_date_days_ago(days: int) -> str:
     return (datetime.now(timezone.utc) - timedelta(days=days)).date().isoformat()
 
 
-def fetch_news(
+def _everything_params(
     api_key: str,
     *,
     q: Optional[str] = None,
@@ -22,11 +31,10 @@ def fetch_news(
     domains: Optional[str] = None,
     exclude_domains: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Call NewsAPI Everything with flexible parameters and return parsed JSON."""
+    """Build NewsAPI Everything query params shared by the sync and async clients."""
     if not api_key:
         raise RuntimeError("Missing NewsAPI key.")
 
-    endpoint = "https://newsapi.org/v2/everything"
     params: Dict[str, Any] = {
         "apiKey": api_key,
         "sortBy": sort_by,
@@ -47,12 +55,43 @@ def fetch_news(
         params["domains"] = domains
     if exclude_domains:
         params["excludeDomains"] = exclude_domains
+    return params
+
+
+def fetch_news(
+    api_key: str,
+    *,
+    q: Optional[str] = None,
+    from_days: Optional[int] = 7,
+    language: Optional[str] = "en",
+    search_in: Optional[str] = "title,description,content",
+    sort_by: Optional[str] = "publishedAt",
+    page_size: Optional[int] = 50,
+    page: Optional[int] = 1,
+    sources: Optional[str] = None,
+    domains: Optional[str] = None,
+    exclude_domains: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Call NewsAPI Everything with flexible parameters and return parsed JSON."""
+    params = _everything_params(
+        api_key,
+        q=q,
+        from_days=from_days,
+        language=language,
+        search_in=search_in,
+        sort_by=sort_by,
+        page_size=page_size,
+        page=page,
+        sources=sources,
+        domains=domains,
+        exclude_domains=exclude_domains,
+    )
 
     max_attempts = 3
     last_error_msg: Optional[str] = None
     for attempt in range(1, max_attempts + 1):
         try:
-            response = requests.get(endpoint, params=params, timeout=20)
+            response = _SESSION.get(EVERYTHING_ENDPOINT, params=params, timeout=20)
             response.raise_for_status()
             data = response.json()
             if data.get("status") != "ok":
@@ -102,6 +141,83 @@ def fetch_news(
     raise RuntimeError(f"Unable to fetch news after retries. Last error: {last_error_msg}")
 
 
+async def fetch_news_async(
+    client: httpx.AsyncClient,
+    api_key: str,
+    *,
+    q: Optional[str] = None,
+    from_days: Optional[int] = 7,
+    language: Optional[str] = "en",
+    search_in: Optional[str] = "title,description,content",
+    sort_by: Optional[str] = "publishedAt",
+    page_size: Optional[int] = 50,
+    page: Optional[int] = 1,
+    sources: Optional[str] = None,
+    domains: Optional[str] = None,
+    exclude_domains: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Async variant of `fetch_news` using a shared, connection-pooled httpx client.
+
+    Retry and error behaviour mirror `fetch_news`, with non-blocking backoff.
+    """
+    params = _everything_params(
+        api_key,
+        q=q,
+        from_days=from_days,
+        language=language,
+        search_in=search_in,
+        sort_by=sort_by,
+        page_size=page_size,
+        page=page,
+        sources=sources,
+        domains=domains,
+        exclude_domains=exclude_domains,
+    )
+
+    max_attempts = 3
+    last_error_msg: Optional[str] = None
+    for attempt in range(1, max_attempts + 1):
+        delay_seconds = 0.5 * (2 ** (attempt - 1))
+        try:
+            response = await client.get(EVERYTHING_ENDPOINT, params=params, timeout=20)
+            response.raise_for_status()
+            data = response.json()
+            if data.get("status") != "ok":
+                message = data.get("message") or str(data)
+                if attempt < max_attempts and ("rate" in message.lower() or "too many" in message.lower()):
+                    await asyncio.sleep(delay_seconds)
+                    continue
+                raise RuntimeError(f"NewsAPI error: {message}")
+            return data
+        except httpx.HTTPStatusError as http_err:
+            status = http_err.response.status_code
+            last_error_msg = f"HTTP {status}: {str(http_err)}"
+            if status in (401, 403):
+                raise RuntimeError("Invalid NewsAPI key or unauthorized. Please verify NEWSAPI_KEY.") from http_err
+            if status == 429:
+                if attempt < max_attempts:
+                    await asyncio.sleep(delay_seconds)
+                    continue
+                raise RuntimeError("NewsAPI rate limit reached. Please wait a moment and try again.") from http_err
+            if status in (500, 502, 503, 504) and attempt < max_attempts:
+                await asyncio.sleep(delay_seconds)
+                continue
+            raise RuntimeError(f"Failed to fetch news (HTTP {status}). Please try again later.") from http_err
+        except httpx.TransportError as net_err:
+            last_error_msg = str(net_err)
+            if attempt < max_attempts:
+                await asyncio.sleep(delay_seconds)
+                continue
+            raise RuntimeError("Network issue when contacting NewsAPI. Please try again shortly.") from net_err
+        except Exception as exc:
+            last_error_msg = str(exc)
+            if attempt < max_attempts:
+                await asyncio.sleep(delay_seconds)
+                continue
+            raise RuntimeError(f"Unexpected error fetching news: {str(exc)[:200]}") from exc
+    raise RuntimeError(f"Unable to fetch news after retries. Last error: {last_error_msg}")
+
+
 def fetch_top_headlines(
     api_key: str,
     *,
@@ -132,7 +248,7 @@ def fetch_top_headlines(
     last_error_msg: Optional[str] = None
     for attempt in range(1, max_attempts + 1):
         try:
-            response = requests.get(endpoint, params=params, timeout=20)
+            response = _SESSION.get(endpoint, params=params, timeout=20)
             response.raise_for_status()
             data = response.json()
             if data.get("status") != "ok":
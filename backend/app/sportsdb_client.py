@@ -9,7 +9,10 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 import os
 
-import requests
+from .http_session import pooled_session
+
+# Shared by the eventsday and eventspastleague scoreboard lookups
+_SESSION = pooled_session()
 
 
 def _get_api_key() -> str:
@@ -131,7 +134,7 @@ def fetch_events_day(
 
     url = f"{_base_url()}/eventsday.php"
     print(f"[sportsdb] GET {url} params={params}")
-    resp = requests.get(url, params=params, timeout=15)
+    resp = _SESSION.get(url, params=params, timeout=15)
     resp.raise_for_status()
     data = resp.json()
     events = data.get('events') or []
@@ -160,7 +163,7 @@ def fetch_past_league_events(
     params: Dict[str, Any] = {'id': league_id}
     url = f"{_base_url()}/eventspastleague.php"
     print(f"[sportsdb] GET {url} params={params}")
-    resp = requests.get(url, params=params, timeout=15)
+    resp = _SESSION.get(url, params=params, timeout=15)
     resp.raise_for_status()
     data = resp.json()
     events = data.get('events') or []
@@ -1 +1 @@
-uvicorn app.main:app --host 0.0.0.0 --port 10000
+uvicorn app.main:app --host 0.0.0.0 --port 10000 --loop uvloop --http httptools --workers "${WEB_CONCURRENCY:-$(nproc)}" --no-access-log